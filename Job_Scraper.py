@@ -1,14 +1,21 @@
 import os
+import time
+from datetime import datetime
 import pandas as pd
 import requests
 import streamlit as st
 from urllib.parse import quote
-from utils import scrape_naukri, scrape_linkedin  # Importing from utils.py
+from job_merge import JobDeduper, iter_all_jobs
+from job_store import JobStore
+from utils import iter_naukri_jobs, iter_linkedin_jobs, job_id_of  # Importing from utils.py
+
+# Seconds between redraws of the partial results table
+REFRESH_INTERVAL = 0.5
 
 st.title("Job Scraper")
 
 # Select Job Platform
-job_platform = st.selectbox("Select Job Platform", ["LinkedIn", "Naukri"])
+job_platform = st.selectbox("Select Job Platform", ["LinkedIn", "Naukri", "All platforms"])
 job_role = st.text_input("Enter Job Role")
 
 # User input for how many jobs to scrape (min 10)
@@ -16,26 +23,84 @@ num_jobs = st.number_input("Enter number of jobs to scrape", min_value=10, value
 
 if st.button("Scrape Jobs"):
     if job_role:
-        with st.spinner("Scraping jobs, please wait..."):
-            if job_platform == "LinkedIn":
-                scraped_data = scrape_linkedin(job_role, num_jobs=num_jobs)
-            else:
-                scraped_data = scrape_naukri(job_role, num_jobs=num_jobs)
-
-        if scraped_data:
-            df = pd.read_csv(scraped_data)
-            st.success(f"Scraping complete! {len(df)} jobs found.")
-            st.dataframe(df)
-            
-            # Provide Download Option
-            with open(scraped_data, "rb") as file:
-                st.download_button(
-                    label="Download CSV",
-                    data=file,
-                    file_name=os.path.basename(scraped_data),
-                    mime="text/csv"
-                )
+        # Postings fetched by earlier runs are served from the job store
+        platform_keys = ["linkedin", "naukri"] if job_platform == "All platforms" else [job_platform.lower()]
+        store = JobStore()
+        runs = {platform_key: store.start_run(platform_key, job_role) for platform_key in platform_keys}
+        previous_runs = [previous for _, previous in runs.values() if previous is not None]
+        previous_run = max(previous_runs) if previous_runs else None
+        deduper = JobDeduper()
+        if job_platform == "LinkedIn":
+            jobs = iter_linkedin_jobs(job_role, num_jobs=num_jobs, store=store)
+        elif job_platform == "Naukri":
+            jobs = iter_naukri_jobs(job_role, num_jobs=num_jobs, store=store)
+        else:
+            # Both scrapers run at once; the list comes back in one schema without cross-posted duplicates
+            jobs = iter_all_jobs(job_role, num_jobs=num_jobs, store=store, deduper=deduper)
+        total = num_jobs * len(platform_keys)
+
+        # Show postings as they arrive instead of after the whole scrape
+        progress = st.progress(0, text="Scraping jobs, please wait...")
+        table = st.empty()
+        rows = []
+        last_draw = 0
+        for job in jobs:
+            rows.append(job)
+            progress.progress(min(len(rows) / total, 1.0), text=f"Scraped {len(rows)} of up to {total} jobs...")
+            if time.monotonic() - last_draw >= REFRESH_INTERVAL:
+                table.dataframe(pd.DataFrame(rows))
+                last_draw = time.monotonic()
+        progress.empty()
+        table.empty()
+
+        # Postings first stored by this run are the ones new since the last run
+        new_keys = {
+            (platform_key, job_id_of(platform_key, job))
+            for platform_key, (started_at, _) in runs.items()
+            for job in store.new_since(platform_key, started_at)
+        }
+        if job_platform == "All platforms":
+            new_jobs = [job for job in rows if (job["Platform"].lower(), job["Job ID"]) in new_keys]
         else:
-            st.error("No jobs found. Try a different role or platform.")
+            new_jobs = [job for job in rows if (platform_keys[0], job_id_of(platform_keys[0], job)) in new_keys]
+        skipped = store.hits
+        store.close()
+
+        # Kept in the session so the results survive the rerun of a download click
+        st.session_state["job_results"] = (job_platform, pd.DataFrame(rows), pd.DataFrame(new_jobs), previous_run, skipped, deduper.dropped)
     else:
         st.warning("Please enter a job role.")
+
+if "job_results" in st.session_state:
+    platform, df, new_df, previous_run, skipped, duplicates = st.session_state["job_results"]
+    if not df.empty:
+        st.success(f"Scraping complete! {len(df)} jobs found.")
+        if duplicates:
+            st.info(f"{duplicates} postings listed on more than one platform were merged.")
+        if previous_run is not None:
+            st.info(f"{len(new_df)} new since the last run on {datetime.fromtimestamp(previous_run):%d %b %Y %H:%M} "
+                    f"({skipped} already stored, not fetched again).")
+        st.dataframe(df)
+
+        # Provide Download Option, built in memory
+        st.download_button(
+            label="Download CSV",
+            data=df.to_csv(index=False).encode("utf-8"),
+            file_name=f"{platform.lower().replace(' ', '_')}_jobs.csv",
+            mime="text/csv"
+        )
+        st.download_button(
+            label="Download JSON Lines",
+            data=df.to_json(orient="records", lines=True, force_ascii=False).encode("utf-8"),
+            file_name=f"{platform.lower().replace(' ', '_')}_jobs.jsonl",
+            mime="application/jsonl"
+        )
+        if previous_run is not None and not new_df.empty:
+            st.download_button(
+                label="Download new since last run (CSV)",
+                data=new_df.to_csv(index=False).encode("utf-8"),
+                file_name=f"{platform.lower().replace(' ', '_')}_jobs_new.csv",
+                mime="text/csv"
+            )
+    else:
+        st.error("No jobs found. Try a different role or platform.")
@@ -1,21 +1,23 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
-import re
-import requests
-import fitz  # PyMuPDF
-import pdfplumber
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from datetime import datetime
 from dotenv import load_dotenv
-from linkedin_api import Linkedin
+from profile_cache import DEFAULT_TTL_DAYS, REFRESH_MODES, ProfileCache
+from analytics import ANALYTICS_SNAPSHOT_PATH, PlacementAnalytics
+from excel_ingest import read_excel_projected
+from experience_table import experience_table_bytes
+from cohorts import extract_cohorts, load_cohorts, parse_sheet_ids
+from metrics import RunMetrics
+from pipeline import classify_stage, content_hash, enrich_stage, extract_stage, report_stage, run_stage
+from resume_fetch import ResumeCache
+from search_index import SearchIndex
+from sheets_sync import changed_rows, row_fingerprints, sheets_client, source_columns, write_back
 import os
+import json
 
 
 scraped_data_df=pd.DataFrame()
+experience_df=pd.DataFrame()
 
 # Custom CSS for styling and positioning
 st.markdown(
@@ -57,290 +59,241 @@ logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s -
 
 # Load environment variables
 load_dotenv()
-options = Options()
-options.add_argument("--headless")
-driver = webdriver.Chrome(options=options)
 
 # Vertical page division using columns
 col1, col2 = st.columns(2)  # Splits the page into two vertical sections
 
+# Stage outputs are kept in session state, keyed by a content hash of their inputs
+stage_store = st.session_state.setdefault("pipeline_stages", {})
+
+# Timings, HTTP calls and cache/retry counts of the latest run, shown in the sidebar
+metrics_panel = st.sidebar.empty()
+
+
+def run_metrics():
+    return st.session_state.setdefault("run_metrics", RunMetrics())
+
+
+# A new ingest starts a new run
+def new_run():
+    st.session_state["run_metrics"] = RunMetrics()
+    return st.session_state["run_metrics"]
+
+
+# live: redrawn while profiles are fetched, without the download button (drawn once per rerun)
+def render_metrics(live=False):
+    summary = run_metrics().summary()
+    with metrics_panel.container():
+        st.subheader("Run metrics")
+        if not (summary["stages"] or summary["http"]):
+            st.caption("No pipeline run yet.")
+            return
+        if summary["stages"]:
+            stages = pd.DataFrame.from_dict(summary["stages"], orient="index")
+            st.dataframe(stages.rename(columns={"seconds": "Seconds", "rows": "Rows", "rows_per_second": "Rows/s"}).round(2))
+        if summary["http"]:
+            st.dataframe(pd.DataFrame([
+                {"Host": host, "Requests": entry["requests"], "Mean ms": round(entry["latency_mean"] * 1000),
+                 "Max ms": round(entry["latency_max"] * 1000),
+                 "Status": ", ".join(f"{code}: {n}" for code, n in sorted(entry["status"].items()))}
+                for host, entry in summary["http"].items()
+            ]), hide_index=True)
+        if summary["counters"]:
+            st.dataframe(pd.Series(summary["counters"], name="Count"))
+        if not live:
+            st.download_button("Download run summary (JSON)", data=json.dumps(summary, indent=2),
+                               file_name="run_summary.json", mime="application/json")
+
 # Left column: Resized Illustration
 with col1:
     st.subheader("LinkedIn Login")
 # Streamlit input for email and password
     EMAIL = st.text_input("## Enter your LinkedIn username or email:")
     PASSWORD = st.text_input("## Enter your password:", type="password")
-    if EMAIL and PASSWORD:
-    # Proceed with authentication if both fields are filled
-        api = Linkedin(EMAIL, PASSWORD, debug=True)
 
-    SERVICE_ACCOUNT_FILE = "credentials.json"
-    SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+    # Profile cache settings: cached profiles are reused until they are older than the TTL
+    with st.expander("Profile cache"):
+        CACHE_TTL_DAYS = st.number_input("Refresh profiles older than (days):", min_value=0, value=DEFAULT_TTL_DAYS)
+        CACHE_REFRESH = st.radio(
+            "Refresh mode:", REFRESH_MODES,
+            format_func=lambda mode: {"stale": "Only stale profiles", "not_placed": "Only stale 'Not placed' profiles", "all": "Everything"}[mode],
+        )
 
-    # Authenticate with Google Sheets
-    try:
-        credentials = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-        client = gspread.authorize(credentials)
-    except Exception as e:
-        st.error(f"Failed to authenticate Google Sheets API. Error: {e}")
-        st.stop()
-
-    # Function to extract LinkedIn URLs from a given cell (text or HTML)
-    def extract_hyperlinks(cell):
-        linkedin_urls = []
-        if isinstance(cell, str):  # Ensure the cell contains a string.
-            linkedin_urls = re.findall(r'https?://(?:www\.)?linkedin\.com/in/[^\s]+', cell)
-        return linkedin_urls
-
-    # Function to extract LinkedIn URLs from PDF
-    def extract_linkedin_from_pdf(pdf_file):
-        linkedin_urls = []
-        with fitz.open(pdf_file) as my_pdf_file:
-            for page_number in range(1, len(my_pdf_file) + 1):
-                page = my_pdf_file[page_number - 1]
-                for pdf_link in page.links():
-                    if "uri" in pdf_link:
-                        url = pdf_link["uri"]
-                        if re.match(r'https?://(?:www\.)?linkedin\.com/in/[^\s]+', url):
-                            linkedin_urls.append(url)
-        return linkedin_urls
-
-    def split_experience(row):
-        # If no experience data is found, return "No Experience Data" for both companies
-        if row['Experience'] == "No experience data found.":
-            return {"Company 1": "No Experience Data", "Company 2": "No Experience Data found" }
-
-        # Split the experience data by newlines to separate different companies
-        companies = row['Experience'].split("\n")
-
-        # Create a dictionary to store the company data
-        company_dict = {}
-
-        # Assign each company data to a Company column
-        for i, company in enumerate(companies):
-            company_dict[f"Company {i + 1}"] = company.strip()  # Strip any extra spaces
-
-        return company_dict
-
-    # Function to process the DataFrame and split experience columns
-    def process_data(df, api):
-        # Split the experience data and add new columns
-        experience_split = df.apply(split_experience, axis=1)
-        experience_part = pd.DataFrame(experience_split.tolist())
-
-        # Merge the new experience columns into the original DataFrame
-        df = pd.concat([df, experience_part], axis=1)
-
-        # Fill any NaN values with "No Experience Data found"
-        df.fillna("No Experience Data found", inplace=True)
-
-        return df
-
-    # Updated classify_experience function
-    def classify_experience(row, company_columns):
-        # Check if Batch Start Date and Batch End Date are valid
-        if pd.isna(row['Batch Start Date']) or pd.isna(row['Batch End Date']):
-            return "Invalid Batch Dates"
+    SERVICE_ACCOUNT_FILE = "credentials.json"
 
+    # Authenticates with Google Sheets only when a sheet is first read, and
+    # keeps the client across reruns
+    def get_sheets_client():
+        if "sheets_client" not in st.session_state:
+            try:
+                st.session_state["sheets_client"] = sheets_client(SERVICE_ACCOUNT_FILE)
+            except Exception as e:
+                raise RuntimeError(f"Failed to authenticate Google Sheets API. Error: {e}") from e
+        return st.session_state["sheets_client"]
+
+    # Logs in to LinkedIn only when the enrichment stage has to run, and keeps
+    # the client for these credentials across reruns
+    def get_linkedin_api():
+        key = content_hash(EMAIL, PASSWORD)
+        cached = st.session_state.get("linkedin_api")
+        if cached is not None and cached[0] == key:
+            return cached[1]
         try:
-            batch_start_date = datetime.strptime(row['Batch Start Date'], "%m %Y")
-            batch_end_date = datetime.strptime(row['Batch End Date'], "%m %Y")
-        except ValueError:
-            return "Invalid Batch Date Format"
-
-        # Loop through the experience columns (e.g., Company 1, Company 2, etc.)
-        for company_col in company_columns:
-            # If the company column is empty or has 'Not placed' data, classify as "No experience"
-            if pd.isna(row.get(company_col, None)) or 'Not placed' in str(row.get(company_col, '')):
-                return "No experience"
+            from linkedin_api import Linkedin
 
-            # Extract the experience data from the company column
-            experience_data = row[company_col]
+            api = Linkedin(EMAIL, PASSWORD)
+        except Exception as e:
+            st.error(f"Failed to authenticate with LinkedIn API. Please check your credentials. Error: {e}")
+            return None
+        st.session_state["linkedin_api"] = (key, api)
+        return api
+
+    # Runs get_profile for every student through the enrichment engine and
+    # shows rows in the UI as they complete
+    def scrape_profiles(api, df_linkedin):
+        cache = ProfileCache(ttl_days=CACHE_TTL_DAYS, refresh=CACHE_REFRESH)
+        progress = st.progress(0.0, text="Scraping LinkedIn profiles...")
+        partial_table = st.empty()
+
+        def show_progress(done, total, records):
+            progress.progress(done / total, text=f"Scraped {done}/{total} LinkedIn profiles...")
+            if done % 10 == 0 or done == total:
+                partial_table.dataframe(pd.DataFrame([r for r in records if r is not None]))
+                render_metrics(live=True)
 
-            # Try to extract the start date from the experience data
+        try:
+            records, payloads, stats = enrich_stage(api, df_linkedin, cache=cache, on_result=show_progress, metrics=run_metrics())
+        finally:
+            cache.close()
+        progress.empty()
+        partial_table.empty()
+        summary = (f"Profiles: {stats.completed} fetched, {stats.failed} failed, "
+                   f"{stats.retries} retries, {stats.throttled} throttled, "
+                   f"cache {cache.hits} hits / {cache.misses} misses")
+        return records, payloads, summary
+
+    # Runs extract -> enrich -> classify for one data source. Every stage is
+    # skipped when its inputs hash to the same key as on the previous rerun.
+    def run_pipeline(source, data, extract_rows=extract_stage):
+        def extract():
+            resume_cache = ResumeCache(ttl_days=CACHE_TTL_DAYS)
             try:
-                start_date_str = experience_data.split("Start Date:")[1].split(",")[0].strip()
-                start_date = datetime.strptime(start_date_str, "%m %Y")
-            except (IndexError, ValueError):
-                return "Not placed"  # If unable to extract the start date, return "Not placed"
-
-            # Classify based on the batch dates
-            if start_date < batch_start_date:
-                return "Pre Imarticus"
-            elif start_date > batch_end_date:
-                return "Post Imarticus"
-            elif batch_start_date <= start_date <= batch_end_date:
-                return "Self Placed"
-            else:
-                return "Unknown"  # In case no condition is met, you can use "Unknown"
-
-        # If no valid experience is found after checking all columns
-        return "No experience data found"
+                return extract_rows(data, resume_cache, metrics=run_metrics())
+            finally:
+                resume_cache.close()
+
+        # LinkedIn URL extraction: every sheet cell in one vectorized pass,
+        # plus the links found in Google Drive resumes
+        extract_key = content_hash(data)
+        df_linkedin = run_stage(stage_store, f"{source}:extract", extract_key, extract)
+
+        if not (EMAIL and PASSWORD):
+            st.warning("Please enter your LinkedIn credentials to enable profile scraping.")
+            return None
+        if df_linkedin.empty:
+            return None
+
+        enrich_key = content_hash(df_linkedin, EMAIL, CACHE_TTL_DAYS, CACHE_REFRESH)
+        enriched = stage_store.get(f"{source}:enrich")
+        if enriched is None or enriched[0] != enrich_key:
+            api = get_linkedin_api()
+            if api is None:
+                return None
+        else:
+            api = None
+        records, payloads, summary = run_stage(stage_store, f"{source}:enrich", enrich_key,
+                                               lambda: scrape_profiles(api, df_linkedin))
+        st.caption(summary)
+
+        classify_key = content_hash(enrich_key)
+        return classify_key, run_stage(stage_store, f"{source}:classify", classify_key,
+                                       lambda: classify_stage(records, payloads, metrics=run_metrics()))
 
 
 # Right column: Additional content
 with col2:
     st.subheader("Data Input")
-    file_type = st.radio("Choose the source of data:", ("Google Sheets", "Excel File"))
-
-    # Convert Batch Start Date and Batch End Date to datetime format with only month and year (month as number)
-    def convert_to_month_year(df, date_column_name):
-        try:
-            df[date_column_name] = pd.to_datetime(df[date_column_name], errors='coerce').dt.to_period('M').dt.strftime('%m %Y')
-        except Exception as e:
-            logging.warning(f"Error converting {date_column_name}: {e}")
-        return df
+    file_type = st.radio("Choose the source of data:", ("Google Sheets", "Multiple cohorts (Google Sheets)", "Excel File"))
+    report_key = None
 
     if file_type == "Google Sheets":
         SHEET_ID = st.text_input("## Enter the Google Sheet URL (found in the sheet URL):")
+        INCREMENTAL_SYNC = st.checkbox("Incremental sync: only process new or changed rows and write results back to the sheet")
 
         if SHEET_ID:
             try:
-                sheet = gc.open_by_key(SHEET_ID).sheet1
-                cell_values = sheet.get_all_values()
-                data = pd.DataFrame(cell_values[1:], columns=cell_values[0])
-                st.dataframe(data)
-
-                # LinkedIn URL Extraction Logic
-                df_linkedin = pd.DataFrame(columns=["Unique ID", "Student Name", "Batch Start Date", "Batch End Date", "Link"])
-
-                # Process each row for LinkedIn URLs
-                for _, row in data.iterrows():
-                    linkedin_urls_collected = []
-                    for cell in row:
-                        linkedin_urls = extract_hyperlinks(cell)
-                        linkedin_urls_collected.extend(linkedin_urls)
-
-                    # Look for Google Drive links to extract PDFs
-                    for cell in row:
-                        if isinstance(cell, str) and 'drive.google.com' in cell:
-                            try:
-                                if "id=" in cell:
-                                    file_id = cell.split("id=")[1].split("&")[0]
-                                elif "/d/" in cell:
-                                    file_id = cell.split("/d/")[1].split("/")[0]
-                                else:
-                                    continue
-
-                                download_url = f"https://drive.google.com/uc?export=download&id={file_id}"
-                                response = requests.get(download_url)
-                                if response.status_code == 200:
-                                    with open("temp.pdf", "wb") as f:
-                                        f.write(response.content)
-
-                                    linkedin_urls_from_pdf = extract_linkedin_from_pdf("temp.pdf")
-                                    linkedin_urls_collected.extend(linkedin_urls_from_pdf)
-                            except Exception as e:
-                                logging.error(f"Error processing Google Drive link: {e}")
-
-                    linkedin_urls_collected = list(set(linkedin_urls_collected))  # Remove duplicates
-
-                    # Add LinkedIn URLs to DataFrame
-                    if linkedin_urls_collected:
-                        for linkedin_url in linkedin_urls_collected:
-                            temp_df = pd.DataFrame({
-                                "Unique ID": [row['Unique ID']],
-                                "Student Name": [row['Student Name']],
-                                "Batch Start Date": [row['Batch Start Date']],
-                                "Batch End Date": [row['Batch End Date']],
-                                "Link": [linkedin_url]
-                            })
-                            df_linkedin = pd.concat([df_linkedin, temp_df], ignore_index=True)
-                    else:
-                        temp_df = pd.DataFrame({
-                            "Unique ID": [row['Unique ID']],
-                            "Student Name": [row['Student Name']],
-                            "Batch Start Date": [row['Batch Start Date']],
-                            "Batch End Date": [row['Batch End Date']],
-                            "Link": ["No LinkedIn URL found"]
-                        })
-                        df_linkedin = pd.concat([df_linkedin, temp_df], ignore_index=True)
-
-                # LinkedIn username extraction for the Google Sheets data
-                df_linkedin["Username"] = df_linkedin["Link"].apply(lambda link: re.search(r'linkedin\.com/in/([^/]+)/?', link).group(1) if pd.notnull(link) and "linkedin.com/in/" in link else "Invalid URL")
-
-                # Apply date conversion to 'Batch Start Date' and 'Batch End Date' after LinkedIn extraction
-                df_linkedin = convert_to_month_year(df_linkedin, "Batch Start Date")
-                df_linkedin = convert_to_month_year(df_linkedin, "Batch End Date")
-
-                # Initialize LinkedIn API
-                api = None
-                if EMAIL and PASSWORD:
-                    try:
-                        api = Linkedin(EMAIL, PASSWORD)
-                    except Exception as e:
-                        st.error(f"Failed to authenticate with LinkedIn API. Please check your credentials. Error: {e}")
-                else:
-                    st.warning("Please enter your LinkedIn credentials to enable profile scraping.")
-
-                if api:
-                    data1 = []
-                    with st.spinner("Scraping LinkedIn profiles..."):
-                        for _, row in df_linkedin.iterrows():
-                            username = row["Username"]
-                            url = row["Link"]
-                            name_text = row["Student Name"]
-                            batch_start_date = row["Batch Start Date"]
-                            batch_end_date = row["Batch End Date"]
-                            unique_id = row["Unique ID"]
-
-                            if username != "Invalid URL":
-                                try:
-                                    profile = api.get_profile(username)
-                                    experience_data = profile.get("experience", [])
-                                    experience_text = "\n".join(
-                                        [
-                                            f"Company: {exp.get('companyName', 'N/A')}, Title: {exp.get('title', 'N/A')}, "
-                                            f"Start Date: {exp.get('timePeriod', {}).get('startDate', {}).get('month', 'N/A')} "
-                                            f"{exp.get('timePeriod', {}).get('startDate', {}).get('year', 'N/A')}, "
-                                            f"End Date: {exp.get('timePeriod', {}).get('endDate', {}).get('month', 'Present')} "
-                                            f"{exp.get('timePeriod', {}).get('endDate', {}).get('year', 'N/A')}"
-                                            for exp in experience_data
-                                        ]
-                                    ) if experience_data else "No experience data found."
-                                except Exception as e:
-                                    logging.warning(f"API failed for {username}: {e}")
-                                    experience_text = "API Error"
-                            else:
-                                experience_text = "Invalid URL"
-
-                            data1.append({
-                                "Unique ID": unique_id,
-                                "Student Name": name_text,
-                                "Batch Start Date": batch_start_date,
-                                "Batch End Date": batch_end_date,
-                                "LinkedIn URL": url,
-                                "Experience": experience_text
-                            })
-
-                    # Display the scraped data
-                    scraped_data_df = pd.DataFrame(data1)
-                    scraped_data_df = process_data(scraped_data_df, api)
-
-                    # Apply experience classification
-                    company_columns = ["Company 1", "Company 2"]  # Modify based on your actual column names
-                    scraped_data_df["Experience Classification"] = scraped_data_df.apply(
-                        lambda row: classify_experience(row, company_columns), axis=1
-                    )
+                # Ingest: the sheet is downloaded once per sheet id unless a reload is requested
+                if st.button("Reload sheet"):
+                    st.session_state["sheet_reloads"] = st.session_state.get("sheet_reloads", 0) + 1
+
+                def ingest_sheet():
+                    client = get_sheets_client()
+                    metrics = new_run()
+                    with metrics.stage("ingest") as stage, metrics.instrumented(client.http_client.session):
+                        worksheet = client.open_by_key(SHEET_ID).sheet1
+                        cell_values = worksheet.get_all_values()
+                        stage.rows = max(0, len(cell_values) - 1)
+                    return worksheet, cell_values
+
+                ingest_key = content_hash(SHEET_ID, st.session_state.get("sheet_reloads", 0))
+                sheet, cell_values = run_stage(stage_store, "sheets:ingest", ingest_key, ingest_sheet)
+                sheet_data = pd.DataFrame(cell_values[1:], columns=cell_values[0])
+                st.dataframe(sheet_data)
+
+                # Result columns written by a previous sync are never scanned as input
+                data = sheet_data[source_columns(sheet_data)]
+                if INCREMENTAL_SYNC:
+                    fingerprints = row_fingerprints(sheet_data)
+                    changed = changed_rows(sheet_data, fingerprints)
+                    data = data.reset_index(drop=True)[changed.to_numpy()]
+                    st.info(f"{len(data)} of {len(sheet_data)} rows are new or changed since the last sync.")
+
+                result = run_pipeline("sheets", data) if not data.empty else None
+                if result is not None:
+                    report_key, (scraped_data_df, experience_df) = result
+
+                    # Write classifications back to the sheet in one batch update, once per result
+                    if INCREMENTAL_SYNC:
+                        def sync():
+                            metrics = run_metrics()
+                            with metrics.stage("sync") as stage, metrics.instrumented(get_sheets_client().http_client.session):
+                                stage.rows = int(changed.sum())
+                                return write_back(sheet, cell_values[0], sheet_data, fingerprints, changed, scraped_data_df)
+
+                        written = run_stage(stage_store, "sheets:sync", content_hash(report_key, changed), sync)
+                        st.success(f"Wrote {written} cells back to the sheet.")
 
                     st.subheader("Scraped LinkedIn Data")
                     st.dataframe(scraped_data_df)
 
-                    # Function to convert DataFrame to CSV
-                    def convert_df_to_csv(df):
-                        return df.to_csv(index=False).encode("utf-8")
-
-                    # Convert DataFrame to CSV
-                    csv_data = convert_df_to_csv(scraped_data_df)
+            except Exception as e:
+                st.error(f"Error accessing Google Sheets: {e}")
 
-                    # Add download button
-                    st.download_button(
-                        label="Download Scraped Data as CSV",
-                        data=csv_data,
-                        file_name="scraped_data.csv",
-                        mime="text/csv",
-                    )
+    # Several spreadsheets and/or every worksheet of each: one run, one report tagged by cohort
+    elif file_type == "Multiple cohorts (Google Sheets)":
+        SHEET_IDS = parse_sheet_ids(st.text_area("## Enter Google Sheet URLs or IDs, one per line:"))
+        ALL_WORKSHEETS = st.checkbox("Process every worksheet of each spreadsheet (one cohort per worksheet)", value=True)
 
+        if SHEET_IDS:
+            try:
+                if st.button("Reload sheets"):
+                    st.session_state["sheet_reloads"] = st.session_state.get("sheet_reloads", 0) + 1
+
+                def ingest_cohorts():
+                    client = get_sheets_client()
+                    metrics = new_run()
+                    with metrics.stage("ingest") as stage, metrics.instrumented(client.http_client.session):
+                        cohort_data = load_cohorts(client, SHEET_IDS, ALL_WORKSHEETS)
+                        stage.rows = len(cohort_data)
+                    return cohort_data
+
+                ingest_key = content_hash(SHEET_IDS, ALL_WORKSHEETS, st.session_state.get("sheet_reloads", 0))
+                data = run_stage(stage_store, "cohorts:ingest", ingest_key, ingest_cohorts)
+                st.dataframe(data.groupby("Cohort", sort=False).size().rename("Students"))
+
+                result = run_pipeline("cohorts", data, extract_cohorts) if not data.empty else None
+                if result is not None:
+                    report_key, (scraped_data_df, experience_df) = result
             except Exception as e:
                 st.error(f"Error accessing Google Sheets: {e}")
 
@@ -350,181 +303,118 @@ with col2:
 
         if excel_file:
             try:
-                data = pd.read_excel(excel_file)
-                st.dataframe(data)
-
-                # LinkedIn URL Extraction Logic
-                df_linkedin = pd.DataFrame(columns=["Unique ID", "Student Name", "Batch Start Date", "Batch End Date", "Link"])
-
-                # Process each row for LinkedIn URLs
-                for _, row in data.iterrows():
-                    linkedin_urls_collected = []
-                    for cell in row:
-                        linkedin_urls = extract_hyperlinks(cell)
-                        linkedin_urls_collected.extend(linkedin_urls)
-
-                    # Look for Google Drive links to extract PDFs
-                    for cell in row:
-                        if isinstance(cell, str) and 'drive.google.com' in cell:
-                            try:
-                                if "id=" in cell:
-                                    file_id = cell.split("id=")[1].split("&")[0]
-                                elif "/d/" in cell:
-                                    file_id = cell.split("/d/")[1].split("/")[0]
-                                else:
-                                    continue
-
-                                download_url = f"https://drive.google.com/uc?export=download&id={file_id}"
-                                response = requests.get(download_url)
-                                if response.status_code == 200:
-                                    with open("temp.pdf", "wb") as f:
-                                        f.write(response.content)
-
-                                    linkedin_urls_from_pdf = extract_linkedin_from_pdf("temp.pdf")
-                                    linkedin_urls_collected.extend(linkedin_urls_from_pdf)
-                            except Exception as e:
-                                logging.error(f"Error processing Google Drive link: {e}")
-
-                    linkedin_urls_collected = list(set(linkedin_urls_collected))  # Remove duplicates
-
-                    # Add LinkedIn URLs to DataFrame
-                    if linkedin_urls_collected:
-                        for linkedin_url in linkedin_urls_collected:
-                            temp_df = pd.DataFrame({
-                                "Unique ID": [row['Unique ID']],
-                                "Student Name": [row['Student Name']],
-                                "Batch Start Date": [row['Batch Start Date']],
-                                "Batch End Date": [row['Batch End Date']],
-                                "Link": [linkedin_url]
-                            })
-                            df_linkedin = pd.concat([df_linkedin, temp_df], ignore_index=True)
-                    else:
-                        temp_df = pd.DataFrame({
-                            "Unique ID": [row['Unique ID']],
-                            "Student Name": [row['Student Name']],
-                            "Batch Start Date": [row['Batch Start Date']],
-                            "Batch End Date": [row['Batch End Date']],
-                            "Link": ["No LinkedIn URL found"]
-                        })
-                        df_linkedin = pd.concat([df_linkedin, temp_df], ignore_index=True)
-
-                # LinkedIn username extraction for the Google Sheets data
-                df_linkedin["Username"] = df_linkedin["Link"].apply(lambda link: re.search(r'linkedin\.com/in/([^/]+)/?', link).group(1) if pd.notnull(link) and "linkedin.com/in/" in link else "Invalid URL")
-
-                # Apply date conversion to 'Batch Start Date' and 'Batch End Date' after LinkedIn extraction
-                df_linkedin = convert_to_month_year(df_linkedin, "Batch Start Date")
-                df_linkedin = convert_to_month_year(df_linkedin, "Batch End Date")
-
-                # Initialize LinkedIn API
-                api = None
-                if EMAIL and PASSWORD:
-                    try:
-                        api = Linkedin(EMAIL, PASSWORD)
-                    except Exception as e:
-                        st.error(f"Failed to authenticate with LinkedIn API. Please check your credentials. Error: {e}")
-                else:
-                    st.warning("Please enter your LinkedIn credentials to enable profile scraping.")
-
-                if api:
-                    data1 = []
-                    with st.spinner("Scraping LinkedIn profiles..."):
-                        for _, row in df_linkedin.iterrows():
-                            username = row["Username"]
-                            url = row["Link"]
-                            name_text = row["Student Name"]
-                            batch_start_date = row["Batch Start Date"]
-                            batch_end_date = row["Batch End Date"]
-                            unique_id = row["Unique ID"]
-
-                            if username != "Invalid URL":
-                                try:
-                                    profile = api.get_profile(username)
-                                    experience_data = profile.get("experience", [])
-                                    experience_text = "\n".join(
-                                        [
-                                            f"Company: {exp.get('companyName', 'N/A')}, Title: {exp.get('title', 'N/A')}, "
-                                            f"Start Date: {exp.get('timePeriod', {}).get('startDate', {}).get('month', 'N/A')} "
-                                            f"{exp.get('timePeriod', {}).get('startDate', {}).get('year', 'N/A')}, "
-                                            f"End Date: {exp.get('timePeriod', {}).get('endDate', {}).get('month', 'Present')} "
-                                            f"{exp.get('timePeriod', {}).get('endDate', {}).get('year', 'N/A')}"
-                                            for exp in experience_data
-                                        ]
-                                    ) if experience_data else "No experience data found."
-                                except Exception as e:
-                                    logging.warning(f"API failed for {username}: {e}")
-                                    experience_text = "API Error"
-                            else:
-                                experience_text = "Invalid URL"
-
-                            data1.append({
-                                "Unique ID": unique_id,
-                                "Student Name": name_text,
-                                "Batch Start Date": batch_start_date,
-                                "Batch End Date": batch_end_date,
-                                "LinkedIn URL": url,
-                                "Experience": experience_text
-                            })
-
-                    # Display the scraped data
-                    scraped_data_df = pd.DataFrame(data1)
-                    scraped_data_df = process_data(scraped_data_df, api)
-
-                    # Apply experience classification
-                    company_columns = ["Company 1", "Company 2"]  # Modify based on your actual column names
-                    scraped_data_df["Experience Classification"] = scraped_data_df.apply(
-                        lambda row: classify_experience(row, company_columns), axis=1
-                    )
+                # Ingest: the workbook is streamed once per uploaded file content,
+                # keeping only the identity and link columns
+                def ingest_excel():
+                    with new_run().stage("ingest") as stage:
+                        ingested = read_excel_projected(excel_file)
+                        stage.rows = ingested[2]
+                    return ingested
+
+                data, preview, total_rows = run_stage(stage_store, "excel:ingest", content_hash(excel_file.getvalue()), ingest_excel)
+                st.dataframe(preview)
+                st.caption(f"First {len(preview)} of {total_rows} rows. Columns read: {', '.join(data.columns)}")
+
+                result = run_pipeline("excel", data)
+                if result is not None:
+                    report_key, (scraped_data_df, experience_df) = result
             except Exception as e:
                 st.error(f"Error reading Excel file: {e}")
-    driver.quit()
 st.subheader("Placement Report")
 st.dataframe(scraped_data_df)
 
-                    # Function to convert DataFrame to CSV
-def convert_df_to_csv(df):
-    return df.to_csv(index=False).encode("utf-8")
+# Report: CSV export, rebuilt only when the classified data changes
+csv_data = run_stage(stage_store, "report", report_key, lambda: report_stage(scraped_data_df, metrics=run_metrics())) if report_key else report_stage(scraped_data_df)
 
-                    # Convert DataFrame to CSV
-csv_data = convert_df_to_csv(scraped_data_df)
-
-                    # Add download button
+# Add download button
 st.download_button(
     label="Download Scraped Data as CSV",
     data=csv_data,
     file_name="scraped_data.csv",
     mime="text/csv",
     )
-def generate_summary_report(scraped_data_df):
+if not experience_df.empty:
+    st.download_button(
+        label="Download Experience Table (Parquet)",
+        data=run_stage(stage_store, "report:parquet", report_key, lambda: experience_table_bytes(experience_df)),
+        file_name="experience.parquet",
+        mime="application/octet-stream",
+    )
+# Placement analytics persisted across runs; reloaded only when another session or a batch run saved it
+def placement_analytics():
+    mtime = os.path.getmtime(ANALYTICS_SNAPSHOT_PATH) if os.path.exists(ANALYTICS_SNAPSHOT_PATH) else None
+    cached = st.session_state.get("analytics")
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, PlacementAnalytics.load())
+        st.session_state["analytics"] = cached
+    return cached[1]
+
+
+def update_analytics(scraped_data_df, experience_df):
+    analytics = placement_analytics()
+    analytics.update_report(scraped_data_df, experience_df)
+    try:
+        analytics.save()
+        st.session_state["analytics"] = (os.path.getmtime(ANALYTICS_SNAPSHOT_PATH), analytics)
+    except OSError as e:
+        logging.warning(f"Could not save placement analytics: {e}")
+
+
+def generate_summary_report(analytics):
     """
-    Generates and displays a summary report for experience classification with names included.
+    Displays the placement summary from the incrementally maintained
+    analytics: classification counts with names, per batch, per batch start
+    month, and time to placement.
     """
-    if "Experience Classification" in scraped_data_df.columns and "Student Name" in scraped_data_df.columns:
-        summary_report = scraped_data_df.groupby(["Experience Classification"])\
-                                      .agg({"Student Name": list, "Experience Classification": "count"})\
-                                      .rename(columns={"Experience Classification": "Count"})\
-                                      .reset_index()
-        
-        st.subheader("Summary Report: Experience Classification")
-        st.dataframe(summary_report)
-        
-        
-        
-        
-        # Prepare CSV data for download
-        csv = summary_report.to_csv(index=False).encode('utf-8')
-        st.download_button(label="Download Summary Report", 
-                           data=csv, 
-                           file_name="experience_summary_report.csv", 
-                           mime="text/csv")
-    else:
-        st.warning("Required columns not found in the DataFrame.")
-
-search_query = st.text_input("Search for specific records:")
+    summary_report = analytics.classification_counts()
+    if summary_report.empty:
+        return
+
+    st.subheader("Summary Report: Experience Classification")
+    st.caption(f"{len(analytics.students)} students across {analytics.runs} runs")
+    st.dataframe(summary_report, hide_index=True)
+
+    by_batch, by_month, time_to_placement = st.tabs(["By batch", "By batch start month", "Time to placement"])
+    with by_batch:
+        st.dataframe(analytics.batch_table())
+    with by_month:
+        st.dataframe(analytics.start_month_table())
+    with time_to_placement:
+        distribution = analytics.time_to_placement()
+        if distribution.empty:
+            st.caption("No placed students yet.")
+        else:
+            st.bar_chart(distribution)
+
+    # Prepare CSV data for download
+    csv = summary_report.to_csv(index=False).encode('utf-8')
+    st.download_button(label="Download Summary Report",
+                       data=csv,
+                       file_name="experience_summary_report.csv",
+                       mime="text/csv")
+
+
+# Each classified report is added to the analytics once, then the summary is shown
+if report_key:
+    run_stage(stage_store, "report:analytics", report_key, lambda: update_analytics(scraped_data_df, experience_df))
+generate_summary_report(placement_analytics())
+
+# Search index over the report, built once per report rather than per keystroke
+search_index = run_stage(stage_store, "report:index", report_key, lambda: SearchIndex(scraped_data_df, experience_df)) if report_key else SearchIndex(scraped_data_df)
+search_query = st.text_input("Search for specific records:", help='Match words or word prefixes; scope them with name:, company:, title:, class:, url: or id:, e.g. company:infosys class:"Self Placed"')
 if search_query:
-                # Filter the data to search across all columns
-    filtered_data = scraped_data_df[scraped_data_df.astype(str).apply(lambda row: search_query.lower() in row.to_string().lower(), axis=1)]
+    filtered_data = scraped_data_df.iloc[search_index.search(search_query)]
     if not filtered_data.empty:
         st.write("Search Results:")
         st.write(filtered_data)
     else:
-        st.write("No matching records found.")
\ No newline at end of file
+        st.write("No matching records found.")
+
+# Metrics panel, and the JSON summary / Prometheus textfile whenever a stage ran
+render_metrics()
+if run_metrics().updated_at > st.session_state.get("metrics_exported_at", 0):
+    try:
+        run_metrics().export()
+    except Exception as e:
+        logging.warning(f"Could not export run metrics: {e}")
+    st.session_state["metrics_exported_at"] = run_metrics().updated_at
@@ -0,0 +1,188 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+ANALYTICS_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analytics_snapshot.json")
+SNAPSHOT_VERSION = 1
+# Labels that mean the student got a job during or after the course
+PLACED_LABELS = ("Self Placed", "Post Imarticus")
+MONTH_YEAR_PATTERN = re.compile(r'^(\d{1,2})\s+(\d{4})$')
+
+
+def month_index(value):
+    """Months since year 0 of an "m yyyy" batch date, or None."""
+    match = MONTH_YEAR_PATTERN.match(str(value).strip()) if isinstance(value, str) else None
+    if match is None or not 1 <= int(match.group(1)) <= 12:
+        return None
+    return int(match.group(2)) * 12 + int(match.group(1)) - 1
+
+
+def _month_label(index):
+    return f"{index // 12}-{index % 12 + 1:02d}" if index is not None else "Unknown"
+
+
+class PlacementAnalytics:
+    """
+    Placement aggregates kept up to date one classified student at a time:
+    counts per classification, per batch and per batch start month, and the
+    distribution of months from batch start to placement. Students are keyed
+    by cohort and Unique ID; a student seen again replaces their previous
+    entry, so every update is O(1) whatever the number of students or runs.
+    save() / load() persist the snapshot between sessions.
+    """
+
+    def __init__(self):
+        self.students = {}
+        self.by_class = Counter()
+        self.by_batch = defaultdict(Counter)
+        self.by_start_month = defaultdict(Counter)
+        self.months_to_placement = Counter()
+        self.members = defaultdict(dict)  # classification -> {key: student name}
+        self.runs = 0
+        self.updated_at = None
+        self._lock = threading.Lock()
+
+    def add(self, key, name, classification, batch, start_month=None, months_to_placement=None):
+        """Adds or replaces one student's entry. Returns False if it was unchanged."""
+        entry = (name, classification, batch, start_month, months_to_placement)
+        with self._lock:
+            previous = self.students.get(key)
+            if previous == entry:
+                return False
+            if previous is not None:
+                self._apply(key, previous, -1)
+                # Re-inserted last, so a loaded snapshot lists names in the same order
+                del self.students[key]
+            self.students[key] = entry
+            self._apply(key, entry, 1)
+            return True
+
+    def _apply(self, key, entry, sign):
+        name, classification, batch, start_month, months = entry
+        self.by_class[classification] += sign
+        self.by_batch[batch][classification] += sign
+        self.by_start_month[_month_label(start_month)][classification] += sign
+        if months is not None:
+            self.months_to_placement[months] += sign
+        if sign > 0:
+            self.members[classification][key] = name
+        else:
+            self.members[classification].pop(key, None)
+
+    def update_report(self, report, experience=None):
+        """
+        Adds every student of a classified report (classify_stage's output);
+        experience is its experience table, for the time to placement.
+        Returns the number of students added or changed.
+        """
+        first_start = pd.Series(index=report.index, dtype=object)
+        if experience is not None and not experience.empty:
+            first = experience[experience["Position"] == 0]
+            start = first[~first.index.duplicated()]["Start"].reindex(report.index)
+            first_start = (start.dt.year * 12 + start.dt.month - 1).where(start.notna())
+
+        # The report has a row per LinkedIn URL; a student with several URLs
+        # counts once, with the first placed row or else their first row
+        students = {}
+        has_cohort = "Cohort" in report.columns
+        for row, placement_start in zip(report.to_dict("records"), first_start):
+            cohort = row["Cohort"] if has_cohort else None
+            student_id = row.get("Unique ID") or row.get("LinkedIn URL")
+            key = f"{cohort}|{student_id}" if has_cohort else str(student_id)
+            if key not in students or (row.get("Experience Classification") in PLACED_LABELS
+                                       and students[key][0].get("Experience Classification") not in PLACED_LABELS):
+                students[key] = (row, placement_start)
+
+        changed = 0
+        for key, (row, placement_start) in students.items():
+            cohort = row["Cohort"] if has_cohort else None
+            batch_start = month_index(row.get("Batch Start Date"))
+            batch = cohort if has_cohort else f"{row.get('Batch Start Date')} - {row.get('Batch End Date')}"
+            classification = row.get("Experience Classification")
+            months = None
+            if classification in PLACED_LABELS and batch_start is not None and pd.notna(placement_start):
+                months = int(placement_start) - batch_start
+            changed += self.add(key, row.get("Student Name"), classification, batch, batch_start, months)
+        with self._lock:
+            self.runs += 1
+            self.updated_at = time.time()
+        return changed
+
+    def classification_counts(self):
+        """Count and student names per classification, largest first."""
+        with self._lock:
+            rows = [{"Experience Classification": label, "Count": count,
+                     "Students": ", ".join(str(name) for name in self.members[label].values())}
+                    for label, count in self.by_class.most_common() if count > 0]
+        return pd.DataFrame(rows, columns=["Experience Classification", "Count", "Students"])
+
+    def _table(self, counts, name):
+        with self._lock:
+            table = pd.DataFrame({key: dict(value) for key, value in counts.items()}).T
+        if table.empty:
+            return table
+        table = table.fillna(0).astype(int)
+        table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0].sort_index()
+        table.index.name = name
+        return table
+
+    def batch_table(self):
+        return self._table(self.by_batch, "Batch")
+
+    def start_month_table(self):
+        return self._table(self.by_start_month, "Batch Start Month")
+
+    def time_to_placement(self):
+        """Placed students by months from batch start to the placement's start month."""
+        with self._lock:
+            counts = {months: n for months, n in self.months_to_placement.items() if n > 0}
+        return pd.Series(counts, name="Students", dtype=int).sort_index().rename_axis("Months after batch start")
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "version": SNAPSHOT_VERSION,
+                "runs": self.runs,
+                "updated_at": self.updated_at,
+                "students": self.students,
+                "by_class": self.by_class,
+                "by_batch": self.by_batch,
+                "by_start_month": self.by_start_month,
+                # JSON keys are strings
+                "months_to_placement": {str(months): n for months, n in self.months_to_placement.items()},
+            }
+
+    def save(self, path=ANALYTICS_SNAPSHOT_PATH):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path=ANALYTICS_SNAPSHOT_PATH):
+        """The saved snapshot, or empty analytics if there is none (or it is from another version)."""
+        analytics = cls()
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return analytics
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return analytics
+        analytics.runs = snapshot["runs"]
+        analytics.updated_at = snapshot["updated_at"]
+        analytics.students = {key: tuple(entry) for key, entry in snapshot["students"].items()}
+        analytics.by_class = Counter(snapshot["by_class"])
+        for batch, counts in snapshot["by_batch"].items():
+            analytics.by_batch[batch] = Counter(counts)
+        for month, counts in snapshot["by_start_month"].items():
+            analytics.by_start_month[month] = Counter(counts)
+        analytics.months_to_placement = Counter({int(months): n for months, n in snapshot["months_to_placement"].items()})
+        for key, (name, classification, *_) in analytics.students.items():
+            analytics.members[classification][key] = name
+        return analytics
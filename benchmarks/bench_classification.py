@@ -0,0 +1,105 @@
+"""
+Benchmark: experience classification.
+
+Compares the original row-wise classify_experience (DataFrame.apply) with the
+vectorized classification.classify_experiences on generated scrape results,
+and times re-classification after the batch dates change.
+
+    python benchmarks/bench_classification.py [rows ...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from classification import classify_experiences, classify_periods, experience_periods  # noqa: E402
+
+
+def legacy_classify_experience(row, company_columns):
+    # classify_experience as it was defined in Profile_Scraper.py
+    if pd.isna(row['Batch Start Date']) or pd.isna(row['Batch End Date']):
+        return "Invalid Batch Dates"
+    try:
+        batch_start_date = datetime.strptime(row['Batch Start Date'], "%m %Y")
+        batch_end_date = datetime.strptime(row['Batch End Date'], "%m %Y")
+    except ValueError:
+        return "Invalid Batch Date Format"
+    for company_col in company_columns:
+        if pd.isna(row.get(company_col, None)) or 'Not placed' in str(row.get(company_col, '')):
+            return "No experience"
+        experience_data = row[company_col]
+        try:
+            start_date_str = experience_data.split("Start Date:")[1].split(",")[0].strip()
+            start_date = datetime.strptime(start_date_str, "%m %Y")
+        except (IndexError, ValueError):
+            return "Not placed"
+        if start_date < batch_start_date:
+            return "Pre Imarticus"
+        elif start_date > batch_end_date:
+            return "Post Imarticus"
+        elif batch_start_date <= start_date <= batch_end_date:
+            return "Self Placed"
+        else:
+            return "Unknown"
+    return "No experience data found"
+
+
+def make_results(rows, companies=3, seed=0):
+    rng = random.Random(seed)
+
+    def month_year():
+        return rng.choice([
+            f"{rng.randint(1, 12):02d} {rng.randint(2018, 2025)}",
+            f"{rng.randint(1, 12)} {rng.randint(2018, 2025)}",
+            "N/A 2020",
+            None,
+        ])
+
+    def company():
+        return rng.choice([
+            f"Company: Acme, Title: Analyst, Start Date: {month_year()}, End Date: Present N/A",
+            f"Company: Acme, Title: Analyst, Start Date: {month_year()}, End Date: Present N/A",
+            "No Experience Data",
+            "No Experience Data found",
+            "API Error",
+        ])
+
+    data = {
+        "Batch Start Date": [rng.choice([f"{rng.randint(1, 12):02d} 2022", None]) for _ in range(rows)],
+        "Batch End Date": [f"{rng.randint(1, 12):02d} 2023" for _ in range(rows)],
+    }
+    for i in range(1, companies + 1):
+        data[f"Company {i}"] = [company() for _ in range(rows)]
+    return pd.DataFrame(data)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'legacy (s)':>12} {'vectorized (s)':>15} {'reclassify (s)':>15}")
+    for rows in sizes:
+        df = make_results(rows)
+        new, new_time = timed(classify_experiences, df)
+
+        # Re-classification after editing batch dates reuses the parsed experience
+        starts, no_experience = experience_periods(df, ["Company 1"])
+        _, reclassify_time = timed(classify_periods, df["Batch Start Date"], df["Batch End Date"], starts, no_experience)
+
+        if rows <= 20000:
+            old, old_time = timed(df.apply, lambda row: legacy_classify_experience(row, ["Company 1", "Company 2"]), 1)
+            assert (old == new).all()
+            print(f"{rows:>8} {old_time:>12.3f} {new_time:>15.3f} {reclassify_time:>15.3f}")
+        else:
+            print(f"{rows:>8} {'-':>12} {new_time:>15.3f} {reclassify_time:>15.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
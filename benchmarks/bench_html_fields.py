@@ -0,0 +1,138 @@
+"""
+Benchmark: job page parsing.
+
+Parses the saved pages in benchmarks/fixtures with the original
+BeautifulSoup/html.parser code and with the compiled html_fields specs on
+each available backend, checks they extract the same postings and reports
+the parse time per posting.
+
+    python benchmarks/bench_html_fields.py [repeats]
+"""
+import os
+import sys
+import time
+
+import soupsieve as sv
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import html_fields  # noqa: E402
+import utils  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+def legacy_linkedin_job(page_source, job_ID, apply_link):
+    job_soup = BeautifulSoup(page_source, "html.parser")
+    return {
+        "Job ID": job_ID,
+        "Job Title": job_soup.find("h2", class_="top-card-layout__title").text.strip() if job_soup.find("h2", class_="top-card-layout__title") else None,
+        "Company Name": job_soup.find("a", class_="topcard__org-name-link").text.strip() if job_soup.find("a", class_="topcard__org-name-link") else None,
+        "Location": job_soup.find("span", class_="topcard__flavor--bullet").text.strip() if job_soup.find("span", class_="topcard__flavor--bullet") else None,
+        "time_posted": job_soup.find("span", class_="posted-time-ago__text").text.strip() if job_soup.find("span", class_="posted-time-ago__text") else None,
+        "job_description": job_soup.find("div", class_="description__text--rich").text.strip() if job_soup.find("div", class_="description__text--rich") else None,
+        "Apply Link": apply_link
+    }
+
+
+def legacy_linkedin_list(page_source):
+    apply_links = []
+    for job in BeautifulSoup(page_source, "html.parser").find_all("li"):
+        apply_link_tag = job.find("a", class_="base-card__full-link")
+        if apply_link_tag:
+            apply_links.append(apply_link_tag["href"])
+    return apply_links
+
+
+LEGACY_NAUKRI_TUPLE = sv.compile(".srp-jobtuple-wrapper")
+LEGACY_NAUKRI_FIELDS = {
+    "heading": sv.compile("h2 a"),
+    "subheading": sv.compile(":scope > div > div:nth-of-type(2) a"),
+    "experience": sv.compile(":scope > div > div:nth-of-type(3) > div > span:nth-of-type(1) > span > span"),
+    "salary": sv.compile(":scope > div > div:nth-of-type(3) > div > span:nth-of-type(2) > span > span"),
+    "location": sv.compile(":scope > div > div:nth-of-type(3) > div > span:nth-of-type(3) > span > span"),
+}
+
+
+def _legacy_select_text(tuple_tag, field, default):
+    tag = LEGACY_NAUKRI_FIELDS[field].select_one(tuple_tag)
+    if tag is None:
+        return default
+    text = tag.get_text(" ", strip=True)
+    return text if text else default
+
+
+def legacy_naukri_page(page_source):
+    soup = BeautifulSoup(page_source, "html.parser")
+    jobs = []
+    for tuple_tag in LEGACY_NAUKRI_TUPLE.select(soup):
+        heading_tag = LEGACY_NAUKRI_FIELDS["heading"].select_one(tuple_tag)
+        if heading_tag is None or not heading_tag.get("href"):
+            continue
+        jobs.append({
+            'Job Role': heading_tag.get_text(" ", strip=True),
+            'Company Name': _legacy_select_text(tuple_tag, "subheading", "Not Available"),
+            'Vacancy Link': heading_tag["href"],
+            'Experience Needed': _legacy_select_text(tuple_tag, "experience", "Not Available"),
+            'Salary': _legacy_select_text(tuple_tag, "salary", "Not Disclosed"),
+            'Location': _legacy_select_text(tuple_tag, "location", "Not Available"),
+            'Job Description': "Not Available"
+        })
+    return jobs
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def timed(parse, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = parse()
+    return (time.perf_counter() - start) / repeats, result
+
+
+def main(repeats):
+    job_page = read_fixture("linkedin_job.html")
+    list_page = read_fixture("linkedin_list.html")
+    naukri_page = read_fixture("naukri_search.html")
+    apply_link = "https://in.linkedin.com/jobs/view/3912345678"
+
+    backends = [backend for backend in html_fields.BACKENDS
+                if backend != "lxml" or html_fields.CSSSelector is not None]
+    cases = {
+        "LinkedIn job page": (
+            lambda: legacy_linkedin_job(job_page, "3912345678", apply_link),
+            lambda backend: {"Job ID": "3912345678",
+                             **utils.LINKEDIN_JOB_FIELDS.extract(html_fields.parse_html(job_page, backend)),
+                             "Apply Link": apply_link},
+            1,
+        ),
+        "LinkedIn list page": (
+            lambda: legacy_linkedin_list(list_page),
+            lambda backend: [card["Apply Link"] for card in utils.LINKEDIN_LIST_FIELDS.extract_all(
+                html_fields.parse_html(list_page, backend)) if card["Apply Link"]],
+            25,
+        ),
+        "Naukri results page": (
+            lambda: legacy_naukri_page(naukri_page),
+            lambda backend: [{**job, "Job Description": "Not Available"} for job in utils.NAUKRI_TUPLE_FIELDS.extract_all(
+                html_fields.parse_html(naukri_page, backend)) if job["Vacancy Link"] is not None],
+            20,
+        ),
+    }
+
+    for name, (legacy, compiled, postings) in cases.items():
+        legacy_time, expected = timed(legacy, repeats)
+        print(f"{name}: legacy html.parser {legacy_time / postings * 1000:.3f} ms/posting")
+        for backend in backends:
+            compiled_time, result = timed(lambda: compiled(backend), repeats)
+            assert result == expected, f"{name} differs on {backend}"
+            print(f"  field spec {backend:<12} {compiled_time / postings * 1000:.3f} ms/posting "
+                  f"({legacy_time / compiled_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
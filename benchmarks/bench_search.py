@@ -0,0 +1,68 @@
+"""
+Benchmark: Placement Report search.
+
+Compares the original per-keystroke scan (astype(str) + row.to_string() for
+every row) with a prebuilt search_index.SearchIndex on a generated report.
+
+    python benchmarks/bench_search.py [rows]
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from search_index import SearchIndex  # noqa: E402
+
+COMPANIES = ["Infosys", "TCS", "Wipro", "Accenture", "Deloitte", "HDFC Bank", "ICICI Bank", "Capgemini", "Cognizant", "KPMG"]
+TITLES = ["Data Analyst", "Business Analyst", "Investment Banking Analyst", "Associate", "Software Engineer"]
+LABELS = ["Pre Imarticus", "Self Placed", "Post Imarticus", "Not placed", "No experience"]
+QUERIES = ["infosys", 'company:infosys class:"Self Placed"', "name:student 4242", "title:data company:wipro", "url:stu-99"]
+
+
+def make_report(rows, seed=0):
+    rng = random.Random(seed)
+    report = pd.DataFrame({
+        "Unique ID": [str(i) for i in range(rows)],
+        "Student Name": [f"Student {i}" for i in range(rows)],
+        "LinkedIn URL": [f"https://www.linkedin.com/in/stu-{i}/" for i in range(rows)],
+        "Experience Classification": [rng.choice(LABELS) for _ in range(rows)],
+    })
+    records = np.repeat(np.arange(rows), 2)
+    experience = pd.DataFrame({
+        "Company": pd.Categorical([rng.choice(COMPANIES) for _ in records]),
+        "Title": pd.Categorical([rng.choice(TITLES) for _ in records]),
+    }, index=pd.Index(records, name="Record"))
+    report["Company 1"] = experience.groupby(level=0)["Company"].first().astype(str).to_numpy()
+    return report, experience
+
+
+def legacy_search(report, query):
+    return report[report.astype(str).apply(lambda row: query.lower() in row.to_string().lower(), axis=1)]
+
+
+def main(rows):
+    report, experience = make_report(rows)
+
+    start = time.perf_counter()
+    index = SearchIndex(report, experience)
+    print(f"rows: {rows}, index build: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    legacy_search(report, "infosys")
+    print(f"legacy scan 'infosys': {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for query in QUERIES:
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            hits = index.search(query)
+            timings.append(time.perf_counter() - start)
+        print(f"{query!r:40} {len(hits):>7} hits  median {np.median(timings) * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,93 @@
+"""
+Benchmark: cold start of the Streamlit pages.
+
+Every measurement runs in a fresh interpreter. For each optional heavy
+dependency it times the bare import; for each page it times the first
+script run with streamlit's AppTest (first paint, nothing entered yet) and a
+rerun, and lists which of the heavy modules the first paint loaded. They
+should only be imported by the stage that needs them.
+
+    python benchmarks/bench_startup.py [--runs 3] [--budget 1.0]
+
+Exits 1 if a page's median first paint is over --budget seconds.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Profile_Scraper.py", "Job_Scraper.py"]
+# Imported lazily: the Sheets / LinkedIn clients, resume parsing and the Naukri browser
+HEAVY_MODULES = ["selenium.webdriver.support.ui", "fitz", "linkedin_api", "gspread",
+                 "google.oauth2.service_account", "openpyxl"]
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+PAGE_SCRIPT = """
+import json, logging, sys, time
+logging.disable(logging.CRITICAL)
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+page = AppTest.from_file({path!r}, default_timeout=60)
+start = time.perf_counter()
+page.run()
+first_paint = time.perf_counter() - start
+start = time.perf_counter()
+page.run()
+rerun = time.perf_counter() - start
+print(json.dumps({{"first_paint": first_paint, "rerun": rerun, "errors": [e.value for e in page.error],
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_python(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per measurement (median is shown)")
+    parser.add_argument("--budget", type=float, default=1.0, help="Allowed first paint, in seconds")
+    args = parser.parse_args(argv)
+
+    print("import (fresh interpreter):")
+    for module in HEAVY_MODULES:
+        try:
+            seconds = statistics.median(float(run_python(IMPORT_SCRIPT.format(module=module))) for _ in range(args.runs))
+        except subprocess.CalledProcessError:
+            print(f"  {module:<32} not installed")
+            continue
+        print(f"  {module:<32} {seconds * 1000:7.0f} ms")
+
+    over_budget = []
+    print("\npages:")
+    for page in PAGES:
+        code = PAGE_SCRIPT.format(root=ROOT, path=os.path.join(ROOT, page), heavy=HEAVY_MODULES)
+        runs = [json.loads(run_python(code)) for _ in range(args.runs)]
+        first_paint = statistics.median(run["first_paint"] for run in runs)
+        rerun = statistics.median(run["rerun"] for run in runs)
+        loaded = sorted({module for run in runs for module in run["loaded"]})
+        print(f"  {page:<20} first paint {first_paint * 1000:6.0f} ms, rerun {rerun * 1000:5.0f} ms, "
+              f"heavy modules loaded: {', '.join(loaded) or 'none'}")
+        for error in runs[0]["errors"]:
+            print(f"    error: {error}")
+        if first_paint > args.budget:
+            over_budget.append(page)
+
+    if over_budget:
+        print(f"\nOver the {args.budget:.1f}s first paint budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Benchmark: LinkedIn URL extraction from a cohort sheet.
+
+Compares the original iterrows + per-row pd.concat loop with the vectorized
+profile_utils.extract_linkedin_links stage on generated sheets.
+
+    python benchmarks/bench_url_extraction.py [rows ...]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from profile_utils import extract_linkedin_links  # noqa: E402
+
+
+def make_sheet(rows, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        username = f"student-{i}-{rng.randint(1000, 9999)}"
+        link = rng.choice([
+            f"https://www.linkedin.com/in/{username}/",
+            f"Profile: https://linkedin.com/in/{username}",
+            "",
+        ])
+        records.append({
+            "Unique ID": i,
+            "Student Name": f"Student {i}",
+            "Batch Start Date": "2023-01-01",
+            "Batch End Date": "2023-07-01",
+            "Email": f"{username}@example.com",
+            "Phone": str(rng.randint(10 ** 9, 10 ** 10)),
+            "LinkedIn": link,
+            "Notes": rng.choice(["", "follow up", "placed via referral"]),
+        })
+    return pd.DataFrame(records)
+
+
+def legacy_extract(data):
+    # The loop Profile_Scraper.py used before the vectorized stage (without Drive links)
+    df_linkedin = pd.DataFrame(columns=["Unique ID", "Student Name", "Batch Start Date", "Batch End Date", "Link"])
+    for _, row in data.iterrows():
+        linkedin_urls_collected = []
+        for cell in row:
+            if isinstance(cell, str):
+                linkedin_urls_collected.extend(re.findall(r'https?://(?:www\.)?linkedin\.com/in/[^\s]+', cell))
+        linkedin_urls_collected = list(set(linkedin_urls_collected))
+        for linkedin_url in linkedin_urls_collected or ["No LinkedIn URL found"]:
+            temp_df = pd.DataFrame({
+                "Unique ID": [row['Unique ID']],
+                "Student Name": [row['Student Name']],
+                "Batch Start Date": [row['Batch Start Date']],
+                "Batch End Date": [row['Batch End Date']],
+                "Link": [linkedin_url]
+            })
+            df_linkedin = pd.concat([df_linkedin, temp_df], ignore_index=True)
+    df_linkedin["Username"] = df_linkedin["Link"].apply(lambda link: re.search(r'linkedin\.com/in/([^/]+)/?', link).group(1) if pd.notnull(link) and "linkedin.com/in/" in link else "Invalid URL")
+    return df_linkedin
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>8}")
+    for rows in sizes:
+        data = make_sheet(rows)
+        new, new_time = timed(extract_linkedin_links, data)
+        # The legacy loop is quadratic; skip it where it would take minutes
+        if rows <= 20000:
+            old, old_time = timed(legacy_extract, data)
+            key = ["Unique ID", "Link", "Username"]
+            assert old[key].astype(str).sort_values(key).values.tolist() == new[key].astype(str).sort_values(key).values.tolist()
+            print(f"{rows:>8} {old_time:>12.3f} {new_time:>15.3f} {old_time / new_time:>7.0f}x")
+        else:
+            print(f"{rows:>8} {'-':>12} {new_time:>15.3f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 10000, 100000])
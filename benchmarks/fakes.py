@@ -0,0 +1,253 @@
+"""
+Local stand-ins for the services the pipelines talk to, for offline benchmarks.
+
+- FixtureServer: an HTTP server on localhost that replays the recorded pages
+  in benchmarks/fixtures for LinkedIn's job list / detail endpoints and
+  serves generated resume PDFs in place of Google Drive downloads.
+- FakeLinkedin: Linkedin.get_profile with configurable latency, error rate
+  and throttling rate.
+- FakeWorksheet: the gspread worksheet calls the Profile Scraper makes
+  (get_all_values, batch_update, add_cols), over a generated cohort.
+"""
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from gspread.utils import a1_to_rowcol
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+COMPANIES = ["Infosys", "TCS", "Wipro", "Accenture", "Deloitte", "HDFC Bank", "ICICI Bank", "Capgemini", "Cognizant", "KPMG"]
+TITLES = ["Data Analyst", "Business Analyst", "Investment Banking Analyst", "Associate", "Software Engineer"]
+COHORT_HEADER = ["Unique ID", "Student Name", "Batch Start Date", "Batch End Date", "Email", "LinkedIn Profile", "Resume"]
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def make_cohort(students, drive_share=0.05, missing_share=0.03, seed=0):
+    """
+    Sheet cells (header row first, all strings) for a generated cohort. Most
+    students have a LinkedIn URL in one of the shapes seen in real sheets;
+    drive_share of them only have a Drive resume link, missing_share neither.
+    """
+    rng = random.Random(seed)
+    rows = [COHORT_HEADER]
+    for i in range(students):
+        start_year = rng.randint(2021, 2024)
+        start_month = rng.randint(1, 12)
+        end_year, end_month = (start_year + 1, start_month - 6) if start_month > 6 else (start_year, start_month + 6)
+        link, resume = "", ""
+        draw = rng.random()
+        if draw < missing_share:
+            pass
+        elif draw < missing_share + drive_share:
+            resume = f"https://drive.google.com/file/d/resume{i:07d}/view?usp=sharing"
+        else:
+            link = rng.choice([
+                f"https://www.linkedin.com/in/student-{i}",
+                f"https://linkedin.com/in/student-{i}/",
+                f"https://www.linkedin.com/in/student-{i}?utm_source=share",
+            ])
+        rows.append([
+            str(100000 + i), f"Student {i}", f"{start_year}-{start_month:02d}-01", f"{end_year}-{end_month:02d}-28",
+            f"student{i}@example.com", link, resume,
+        ])
+    return rows
+
+
+RESUME_ID_PLACEHOLDER = "X" * 13
+
+
+def resume_pdf(file_id=RESUME_ID_PLACEHOLDER):
+    # A one-page resume whose LinkedIn URL is a link annotation, as in real resumes
+    import fitz
+
+    document = fitz.open()
+    page = document.new_page()
+    page.insert_text((72, 72), f"Resume of {file_id}")
+    page.insert_link({"kind": fitz.LINK_URI, "from": fitz.Rect(72, 80, 300, 100),
+                      "uri": f"https://www.linkedin.com/in/{file_id}"})
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+class FixtureServer:
+    """
+    Serves, on a free localhost port:
+      /jobs-guest/jobs/api/seeMoreJobPostings/search  recorded list page, list_pages pages deep
+      /jobs-guest/jobs/api/jobPosting/<id>             recorded job detail page
+      /uc?export=download&id=<id>                      generated resume PDF
+    Every response waits latency seconds. requests counts hits per route.
+    """
+
+    def __init__(self, latency=0.0, list_pages=40):
+        self.latency = latency
+        self.list_pages = list_pages
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._list_page = read_fixture("linkedin_list.html")
+        self._job_page = read_fixture("linkedin_job.html").encode("utf-8")
+        # Cohort resume ids all have the placeholder's length, so patching the
+        # template keeps the PDF's byte offsets valid
+        self._pdf_template = resume_pdf()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def count(self, route):
+        with self._lock:
+            self.requests[route] += 1
+
+    def total_requests(self):
+        with self._lock:
+            return sum(self.requests.values())
+
+    def _pdf(self, file_id):
+        if len(file_id) != len(RESUME_ID_PLACEHOLDER):
+            return resume_pdf(file_id)
+        return self._pdf_template.replace(RESUME_ID_PLACEHOLDER.encode(), file_id.encode())
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path.endswith("/seeMoreJobPostings/search"):
+                    server.count("linkedin_list")
+                    page = int(query.get("start", ["0"])[0]) // 25
+                    body = "" if page >= server.list_pages else server._list_page.replace("39123456", f"{39123456 + page}")
+                    self._send(200, body.encode("utf-8"), "text/html")
+                elif url.path.startswith("/jobs-guest/jobs/api/jobPosting/"):
+                    server.count("linkedin_job")
+                    self._send(200, server._job_page, "text/html")
+                elif url.path == "/uc":
+                    server.count("drive")
+                    self._send(200, server._pdf(query.get("id", ["unknown"])[0]), "application/pdf")
+                else:
+                    server.count("not_found")
+                    self._send(404, b"", "text/plain")
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FakeLinkedin:
+    """
+    Stand-in for linkedin_api.Linkedin. get_profile sleeps latency seconds
+    and then fails with a dropped connection with error_rate, starts a
+    lockout with throttle_rate, or returns a profile with 0-3 experience
+    entries derived from the username. During a lockout the next
+    LOCKOUT_CALLS calls get an empty profile, as the real client returns for
+    a refused request.
+    """
+
+    LOCKOUT_CALLS = 5
+
+    def __init__(self, latency=0.0, error_rate=0.0, throttle_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.calls = 0
+        self._lockout = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get_profile(self, username):
+        with self._lock:
+            self.calls += 1
+            draw = self._rng.random()
+            if not self._lockout and draw < self.throttle_rate:
+                self._lockout = self.LOCKOUT_CALLS
+            refused = self._lockout > 0
+            self._lockout = max(0, self._lockout - 1)
+        if self.latency:
+            time.sleep(self.latency)
+        if refused:
+            # Like linkedin_api, which logs a refused request and returns an empty profile
+            return {}
+        if draw < self.throttle_rate + self.error_rate:
+            raise requests.ConnectionError("Connection reset by peer")
+
+        seed = int(hashlib.md5(username.encode()).hexdigest()[:8], 16)
+        rng = random.Random(seed)
+        experience = []
+        for _ in range(rng.randint(0, 3)):
+            experience.append({
+                "companyName": rng.choice(COMPANIES),
+                "title": rng.choice(TITLES),
+                "timePeriod": {"startDate": {"month": rng.randint(1, 12), "year": rng.randint(2019, 2025)}},
+            })
+        return {"experience": experience}
+
+
+class FakeWorksheet:
+    """
+    The gspread worksheet calls the Profile Scraper makes, over in-memory
+    cells. batch_update writes its single-cell ranges into the cells, so a
+    second sync reads back what the first one wrote.
+    """
+
+    def __init__(self, cells, latency=0.0):
+        self.cells = [list(row) for row in cells]
+        self.col_count = len(cells[0])
+        self.latency = latency
+        self.calls = Counter()
+
+    def get_all_values(self):
+        self.calls["get_all_values"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        # Like Sheets: every row padded with "" to the widest one
+        width = max(len(row) for row in self.cells)
+        return [list(row) + [""] * (width - len(row)) for row in self.cells]
+
+    def add_cols(self, cols):
+        self.calls["add_cols"] += 1
+        self.col_count += cols
+
+    def batch_update(self, updates, value_input_option=None):
+        self.calls["batch_update"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        for update in updates:
+            row, col = a1_to_rowcol(update["range"])
+            self.cells.extend([] for _ in range(row - len(self.cells)))
+            cells = self.cells[row - 1]
+            cells.extend([""] * (col - len(cells)))
+            cells[col - 1] = str(update["values"][0][0])
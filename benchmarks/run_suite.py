@@ -0,0 +1,249 @@
+"""
+Offline benchmark suite for the job scrapers and the profile pipeline.
+
+Nothing leaves the machine: LinkedIn job pages and Drive resumes come from a
+local fixture server, get_profile from FakeLinkedin and the sheet from
+FakeWorksheet (see benchmarks/fakes.py). The Naukri scraper drives Chrome, so
+only its parsing of recorded result pages is timed ("naukri_parse"). For
+every cohort size each profile pipeline stage is timed, with its peak traced
+memory and request rate; the sheet sync is timed twice, the second time
+(resync) over the sheet as the first one left it.
+
+    python benchmarks/run_suite.py                       # 1k, 10k and 100k students
+    python benchmarks/run_suite.py --sizes 1000 --api-latency 0.01 --error-rate 0.02
+
+Results are written to benchmarks/results/<time>-<commit>.json and compared
+with the latest earlier result run with the same settings; stages that got
+slower by more than --threshold are reported as regressions.
+"""
+import argparse
+import glob
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import enrichment  # noqa: E402
+import http_transport  # noqa: E402
+import pipeline  # noqa: E402
+import resume_fetch  # noqa: E402
+import sheets_sync  # noqa: E402
+import utils  # noqa: E402
+from analytics import PlacementAnalytics  # noqa: E402
+from excel_ingest import read_excel_projected  # noqa: E402
+from fakes import FakeLinkedin, FakeWorksheet, FixtureServer, make_cohort, read_fixture  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [1000, 10000, 100000]
+# Slowdowns smaller than this are timer noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.05
+
+
+class Suite:
+    def __init__(self, track_memory=True):
+        self.track_memory = track_memory
+        self.results = []
+
+    def measure(self, group, stage, run, items, requests=None):
+        """
+        Runs run() once and records its wall time, peak traced memory and
+        throughput. items is a callable of run()'s result giving the number
+        of rows processed; requests gives the requests made during the stage.
+        """
+        before = requests() if requests else 0
+        if self.track_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = run()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if self.track_memory else 0
+        if self.track_memory:
+            tracemalloc.stop()
+        made = (requests() - before) if requests else 0
+        count = items(result)
+
+        self.results.append({
+            "group": group,
+            "stage": stage,
+            "seconds": round(seconds, 4),
+            "peak_mb": round(peak / 2 ** 20, 2),
+            "items": count,
+            "items_per_s": round(count / seconds, 1) if seconds else None,
+            "requests": made,
+            "rps": round(made / seconds, 1) if seconds and made else 0,
+        })
+        print(f"{group:>14} {stage:<14} {seconds:9.3f}s {peak / 2 ** 20:9.1f} MB "
+              f"{count:>8} items {made:>8} requests")
+        return result
+
+
+def run_job_scrapers(suite, server, args):
+    utils.LINKEDIN_LIST_URL = server.url + "/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={role}&location={location}&start={start}"
+    utils.LINKEDIN_JOB_URL = server.url + "/jobs-guest/jobs/api/jobPosting/{job_id}"
+    # A response cache in memory: the first scrape starts cold, the repeat is served from it
+    http_transport.set_transport(http_transport.Transport(cache_path=":memory:"))
+    suite.measure("jobs", "linkedin", lambda: list(utils.iter_linkedin_jobs("data analyst", num_jobs=args.jobs)),
+                  len, server.total_requests)
+    suite.measure("jobs", "linkedin_cached", lambda: list(utils.iter_linkedin_jobs("data analyst", num_jobs=args.jobs)),
+                  len, server.total_requests)
+
+    # Naukri parse only: the scrape itself needs Chrome, so recorded result pages go straight to the parser
+    naukri_page = read_fixture("naukri_search.html")
+    pages = max(1, args.jobs // 20)
+    suite.measure("jobs", "naukri_parse",
+                  lambda: [job for _ in range(pages) for job in utils._parse_naukri_page(naukri_page)], len)
+
+
+def run_cohort(suite, server, students, args):
+    group = f"cohort_{students}"
+    worksheet = FakeWorksheet(make_cohort(students, seed=students), latency=args.sheets_latency)
+    api = FakeLinkedin(args.api_latency, args.error_rate, args.throttle_rate)
+
+    cells = suite.measure(group, "ingest", worksheet.get_all_values, lambda cells: len(cells) - 1)
+    data = pd.DataFrame(cells[1:], columns=cells[0])
+
+    if args.excel:
+        # The same cohort as an uploaded workbook, read the streaming way the Excel input does
+        workbook = io.BytesIO()
+        data.to_excel(workbook, index=False)
+        suite.measure(group, "excel_ingest", lambda: read_excel_projected(workbook), lambda result: result[2])
+
+    resume_fetch.DRIVE_DOWNLOAD_URL = server.url + "/uc?export=download&id={file_id}"
+    df_linkedin = suite.measure(group, "extract", lambda: pipeline.extract_stage(data), len, server.total_requests)
+
+    bucket = enrichment.TokenBucket(rate=args.api_rate, capacity=max(1, args.workers))
+    records, payloads, _ = suite.measure(
+        group, "enrich",
+        lambda: pipeline.enrich_stage(api, df_linkedin, workers=args.workers, bucket=bucket, max_retries=args.max_retries),
+        lambda result: len(result[0]), lambda: api.calls)
+
+    report, experience = suite.measure(group, "classify", lambda: pipeline.classify_stage(records, payloads, save_history=False),
+                                       lambda result: len(result[0]))
+    suite.measure(group, "report", lambda: pipeline.report_stage(report), lambda _: len(report))
+    suite.measure(group, "search_index", lambda: SearchIndex(report, experience), lambda index: index.size)
+
+    analytics = PlacementAnalytics()
+    suite.measure(group, "analytics", lambda: analytics.update_report(report, experience), lambda _: len(report))
+    snapshot = os.path.join(RESULTS_DIR, f"analytics_{students}.json")
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    analytics.save(snapshot)
+    suite.measure(group, "analytics_load", lambda: PlacementAnalytics.load(snapshot).classification_counts(),
+                  lambda _: len(report))
+    os.remove(snapshot)
+
+    def sync():
+        fingerprints = sheets_sync.row_fingerprints(data)
+        changed = sheets_sync.changed_rows(data, fingerprints)
+        return sheets_sync.write_back(worksheet, cells[0], data, fingerprints, changed, report)
+
+    suite.measure(group, "sync", sync, lambda updates: len(data),
+                  lambda: worksheet.calls["batch_update"] + worksheet.calls["add_cols"])
+
+    def resync():
+        # Nothing changed since the sync above, so no row should be written again
+        synced_cells = worksheet.get_all_values()
+        synced = pd.DataFrame(synced_cells[1:], columns=synced_cells[0])
+        fingerprints = sheets_sync.row_fingerprints(synced)
+        changed = sheets_sync.changed_rows(synced, fingerprints)
+        return sheets_sync.write_back(worksheet, synced_cells[0], synced, fingerprints, changed, report)
+
+    suite.measure(group, "resync", resync, lambda updates: len(data),
+                  lambda: worksheet.calls["batch_update"] + worksheet.calls["add_cols"])
+
+
+def git_version():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def previous_result(config):
+    for path in sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")), reverse=True):
+        with open(path, encoding="utf-8") as f:
+            earlier = json.load(f)
+        if earlier.get("config") == config:
+            return path, earlier
+    return None, None
+
+
+def compare(results, earlier, threshold):
+    baseline = {(row["group"], row["stage"]): row for row in earlier["results"]}
+    regressions = []
+    for row in results:
+        old = baseline.get((row["group"], row["stage"]))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        slower = row["seconds"] - old["seconds"] >= MIN_REGRESSION_SECONDS
+        flag = "  REGRESSION" if ratio > threshold and slower else ""
+        print(f"{row['group']:>14} {row['stage']:<14} {old['seconds']:9.3f}s -> {row['seconds']:9.3f}s ({ratio:.2f}x){flag}")
+        if flag:
+            regressions.append(row)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the scrapers and the profile pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Cohort sizes (students)")
+    parser.add_argument("--jobs", type=int, default=200, help="Postings per job scraper run")
+    parser.add_argument("--workers", type=int, default=16, help="Enrichment workers")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Seconds per fake get_profile call")
+    parser.add_argument("--api-rate", type=float, default=1e9, help="get_profile rate limit (calls per second)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of get_profile calls that fail")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of get_profile calls throttled")
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--http-latency", type=float, default=0.0, help="Seconds per fixture server response")
+    parser.add_argument("--sheets-latency", type=float, default=0.0, help="Seconds per fake Sheets call")
+    parser.add_argument("--excel", action="store_true", help="Also time reading the cohort from an .xlsx workbook")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (it slows Python-heavy stages)")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    parser.add_argument("--no-save", action="store_true", help="Do not store the results")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    # Retries should cost time in proportion to the fake latency, not minutes
+    enrichment.BASE_BACKOFF = max(args.api_latency, 0.001)
+    enrichment.MAX_BACKOFF = enrichment.BASE_BACKOFF * 8
+
+    config = {key: value for key, value in vars(args).items() if key not in ("threshold", "no_save")}
+    suite = Suite(track_memory=not args.no_memory)
+    with FixtureServer(latency=args.http_latency) as server:
+        run_job_scrapers(suite, server, args)
+        for students in args.sizes:
+            run_cohort(suite, server, students, args)
+
+    path, earlier = previous_result(config)
+    regressions = []
+    if earlier is not None:
+        print(f"\nCompared with {os.path.basename(path)} ({earlier['version']}):")
+        regressions = compare(suite.results, earlier, args.threshold)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        version = git_version()
+        output = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{version}.json")
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "created": datetime.now().isoformat(timespec="seconds"),
+                       "config": config, "results": suite.results}, f, indent=2)
+        print(f"\nResults written to {os.path.relpath(output, ROOT)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
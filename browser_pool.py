@@ -0,0 +1,126 @@
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+
+# Upper bound on Chrome processes alive at once across all pages and sessions
+DEFAULT_MAX_DRIVERS = 2
+# A driver is restarted after this many page loads to keep its memory in check
+DEFAULT_MAX_PAGES = 50
+
+
+def _new_chrome(headless=True):
+    # Selenium is only imported once a scraper actually asks for a browser
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(options=options)
+
+
+class DriverPool:
+    """
+    Process-wide pool of Chrome drivers. Drivers are started lazily on first
+    checkout, health-checked before reuse and recycled after max_pages loads.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_DRIVERS, max_pages=DEFAULT_MAX_PAGES, headless=True):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.headless = headless
+        self._idle = []
+        self._pages = {}
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def _healthy(self, driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        # Called without the lock: quitting a hung Chrome can take a while
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Failed to quit Chrome driver: {e}")
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def acquire(self):
+        while True:
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    self._cond.wait()
+                if not self._idle:
+                    self._size += 1
+                    break
+                driver = self._idle.pop()
+            # Health-check outside the lock so other threads can still check out and return drivers
+            if self._healthy(driver):
+                return driver
+            logging.warning("Discarding unresponsive Chrome driver")
+            self._discard(driver)
+
+        # Start Chrome outside the lock so other threads can still return drivers
+        try:
+            driver = _new_chrome(self.headless)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self._pages[id(driver)] = 0
+        return driver
+
+    def release(self, driver, discard=False):
+        if discard or self._pages.get(id(driver), 0) >= self.max_pages:
+            self._discard(driver)
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    def load(self, driver, url):
+        # Navigate and count the page towards the driver's recycle budget
+        driver.get(url)
+        self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        failed = False
+        try:
+            yield driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(driver, discard=failed and not self._healthy(driver))
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    # Module state outlives Streamlit reruns, so every page shares this pool
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,141 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# "m yyyy" exactly as datetime.strptime(value, "%m %Y") accepts it
+MONTH_YEAR_PATTERN = r'^(\d{1,2})\s+(\d{4})$'
+# Text between the first "Start Date:" and the next comma of a company entry
+START_DATE_PATTERN = r'Start Date:((?:(?!Start Date:)[^,])*)'
+COMPANY_COLUMN_PATTERN = re.compile(r'^Company (\d+)$')
+
+LABELS = np.array([
+    "Invalid Batch Dates",
+    "Invalid Batch Date Format",
+    "No experience data found",
+    "No experience",
+    "Not placed",
+    "Pre Imarticus",
+    "Post Imarticus",
+    "Self Placed",
+], dtype=object)
+(INVALID_DATES, INVALID_FORMAT, NO_DATA, NO_EXPERIENCE, NOT_PLACED, PRE, POST, SELF) = range(len(LABELS))
+
+
+def company_columns_of(df):
+    # "Company 1", "Company 2", ... in numeric order, however many there are
+    numbered = [(int(m.group(1)), col) for col in df.columns if (m := COMPANY_COLUMN_PATTERN.match(str(col)))]
+    return [col for _, col in sorted(numbered)]
+
+
+def parse_month_periods(values):
+    """
+    Parses "m yyyy" strings into month numbers (year * 12 + month - 1) as a
+    float array; anything strptime("%m %Y") would reject becomes NaN.
+    """
+    # Cohorts share a handful of distinct dates, so only the unique values are parsed
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(MONTH_YEAR_PATTERN)
+    month = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=float)
+    year = pd.to_numeric(parts[1], errors="coerce").to_numpy(dtype=float)
+    unique_periods = year * 12 + month - 1
+    unique_periods[(month < 1) | (month > 12)] = np.nan
+    # factorize marks missing values with -1
+    return np.append(unique_periods, np.nan)[codes]
+
+
+def experience_periods(df, company_columns=None):
+    """
+    Parses the start date of every company column once.
+
+    Returns (starts, no_experience): rows x companies arrays holding the start
+    month number (NaN when it cannot be read) and whether the cell is empty or
+    marked 'Not placed'.
+    """
+    if company_columns is None:
+        company_columns = company_columns_of(df)
+
+    rows = len(df)
+    starts = np.full((rows, len(company_columns)), np.nan)
+    no_experience = np.ones((rows, len(company_columns)), dtype=bool)
+    for j, col in enumerate(company_columns):
+        if col not in df.columns:
+            continue
+        cells = df[col]
+        text = cells.astype(str)
+        no_experience[:, j] = (cells.isna() | text.str.contains("Not placed", regex=False)).to_numpy()
+        starts[:, j] = parse_month_periods(text.str.extract(START_DATE_PATTERN, expand=False).str.strip())
+    return starts, no_experience
+
+
+def classify_periods(batch_start_raw, batch_end_raw, starts, no_experience):
+    """
+    Labels every (row, company) pair with array comparisons only. Batch dates
+    are the raw "m yyyy" columns, so edited batch dates can be re-classified
+    without re-parsing the experience data.
+    """
+    batch_missing = (pd.isna(batch_start_raw) | pd.isna(batch_end_raw)).to_numpy()
+    batch_start = parse_month_periods(batch_start_raw)[:, None]
+    batch_end = parse_month_periods(batch_end_raw)[:, None]
+    batch_invalid = (np.isnan(batch_start) | np.isnan(batch_end))
+
+    codes = np.select(
+        [
+            batch_missing[:, None],
+            batch_invalid,
+            no_experience,
+            np.isnan(starts),
+            starts < batch_start,
+            starts > batch_end,
+        ],
+        [INVALID_DATES, INVALID_FORMAT, NO_EXPERIENCE, NOT_PLACED, PRE, POST],
+        default=SELF,
+    )
+    return codes
+
+
+def classify_companies(df, company_columns=None):
+    """Returns a rows x companies frame with the classification of each experience."""
+    if company_columns is None:
+        company_columns = company_columns_of(df)
+    starts, no_experience = experience_periods(df, company_columns)
+    codes = classify_periods(df["Batch Start Date"], df["Batch End Date"], starts, no_experience)
+    return pd.DataFrame(LABELS[codes], index=df.index, columns=company_columns)
+
+
+def classify_experiences(df, company_columns=None):
+    """
+    Vectorized "Experience Classification" column. A student is labelled by
+    their first (most recent) company; with no company columns at all the
+    label is "No experience data found" unless the batch dates are invalid.
+    """
+    if company_columns is None:
+        company_columns = company_columns_of(df)
+    starts, no_experience = experience_periods(df, company_columns[:1])
+    if not company_columns:
+        codes = classify_periods(df["Batch Start Date"], df["Batch End Date"],
+                                 np.zeros((len(df), 1)), np.zeros((len(df), 1), dtype=bool))
+        codes = np.where(codes[:, 0] >= NO_EXPERIENCE, NO_DATA, codes[:, 0])
+    else:
+        codes = classify_periods(df["Batch Start Date"], df["Batch End Date"], starts, no_experience)[:, 0]
+    return pd.Series(LABELS[codes], index=df.index, name="Experience Classification")
+
+
+def classify_experience_table(report, experience):
+    """
+    "Experience Classification" read straight from the long-form experience
+    table (experience_table.build_experience_table), aligned on report.index.
+    Gives the same labels as classify_experiences on the Company N columns.
+    """
+    first = experience[experience["Position"] == 0]
+    first = first[~first.index.duplicated()].reindex(report.index)
+
+    start = first["Start"]
+    # Period NaT reports year/month -1, so mask it explicitly
+    starts = (start.dt.year * 12 + start.dt.month - 1).where(start.notna()).to_numpy(dtype=float)[:, None]
+    no_experience = np.zeros_like(starts, dtype=bool)
+    for col in ("Company", "Title"):
+        no_experience[:, 0] |= first[col].astype(str).str.contains("Not placed", regex=False).to_numpy()
+
+    codes = classify_periods(report["Batch Start Date"], report["Batch End Date"], starts, no_experience)[:, 0]
+    return pd.Series(LABELS[codes], index=report.index, name="Experience Classification")
@@ -0,0 +1,107 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import pandas as pd
+
+from http_transport import get_transport
+from metrics import in_run_context
+from pipeline import extract_stage, timed
+from profile_utils import IDENTITY_COLUMNS
+from sheets_sync import source_columns
+
+# Multi-cohort runs: one worksheet per batch, several spreadsheets per center.
+# Every cohort is read and extracted concurrently, then all students go
+# through one enrichment run (one profile cache, one LinkedIn rate limit) and
+# one report, tagged with the cohort each row came from.
+COHORT_COLUMN = "Cohort"
+DEFAULT_WORKERS = 4
+
+SHEET_URL_PATTERN = re.compile(r"/spreadsheets/d/([A-Za-z0-9_-]+)")
+
+
+def parse_sheet_ids(text):
+    """Sheet keys from text holding keys and/or sheet URLs, separated by commas, spaces or newlines."""
+    sheet_ids = []
+    for token in re.split(r"[\s,;]+", text or ""):
+        match = SHEET_URL_PATTERN.search(token)
+        sheet_id = match.group(1) if match else token
+        if sheet_id and sheet_id not in sheet_ids:
+            sheet_ids.append(sheet_id)
+    return sheet_ids
+
+
+def open_cohorts(client, sheet_ids, all_worksheets=False, workers=DEFAULT_WORKERS):
+    """
+    (label, worksheet) for the first worksheet of each spreadsheet, or for
+    every worksheet with all_worksheets. Labels are "<spreadsheet> / <worksheet>".
+    """
+    def open_spreadsheet(sheet_id):
+        spreadsheet = client.open_by_key(sheet_id)
+        worksheets = spreadsheet.worksheets() if all_worksheets else [spreadsheet.sheet1]
+        return [(f"{spreadsheet.title} / {worksheet.title}", worksheet) for worksheet in worksheets]
+
+    if not sheet_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sheet_ids)))) as executor:
+        return [cohort for cohorts in executor.map(in_run_context(open_spreadsheet), sheet_ids) for cohort in cohorts]
+
+
+def read_cohorts(cohorts, workers=DEFAULT_WORKERS):
+    """
+    Downloads every cohort's worksheet concurrently and stacks them into one
+    frame with a COHORT_COLUMN first. Empty worksheets are left out.
+    """
+    def read(cohort):
+        label, worksheet = cohort
+        cell_values = worksheet.get_all_values()
+        if len(cell_values) < 2:
+            logging.warning(f"Cohort {label} has no student rows, skipping")
+            return None
+        frame = pd.DataFrame(cell_values[1:], columns=cell_values[0])
+        frame = frame[source_columns(frame)]
+        frame.insert(0, COHORT_COLUMN, label)
+        return frame
+
+    if not cohorts:
+        return pd.DataFrame(columns=[COHORT_COLUMN])
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(cohorts)))) as executor:
+        frames = [frame for frame in executor.map(in_run_context(read), cohorts) if frame is not None]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[COHORT_COLUMN])
+
+
+def load_cohorts(client, sheet_ids, all_worksheets=False, workers=DEFAULT_WORKERS):
+    return read_cohorts(open_cohorts(client, sheet_ids, all_worksheets, workers), workers)
+
+
+def extract_cohorts(data, resume_cache=None, metrics=None, workers=DEFAULT_WORKERS, **resume_options):
+    """
+    extract_stage for each cohort of data (as returned by read_cohorts),
+    concurrently. Returns one df_linkedin with the COHORT_COLUMN first.
+    Cohorts without the identity columns are logged and skipped. The
+    cohorts' Drive downloads are recorded in metrics under one "extract" stage.
+    """
+    def extract(label, cohort):
+        # Columns only other worksheets have are all-NaN here
+        cohort = cohort.drop(columns=COHORT_COLUMN).dropna(axis=1, how="all").reset_index(drop=True)
+        missing = [column for column in IDENTITY_COLUMNS if column not in cohort.columns]
+        if missing:
+            logging.warning(f"Cohort {label} has no {', '.join(missing)} column, skipping")
+            return None
+        df_linkedin = extract_stage(cohort, resume_cache, **resume_options)
+        df_linkedin.insert(0, COHORT_COLUMN, label)
+        return df_linkedin
+
+    session = get_transport().session
+    with timed(metrics, "extract") as stage, metrics.instrumented(session) if metrics is not None else nullcontext():
+        cohorts = list(data.groupby(COHORT_COLUMN, sort=False)) if not data.empty else []
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(cohorts) or 1))) as executor:
+            frames = [frame for frame in executor.map(in_run_context(lambda cohort: extract(*cohort)), cohorts) if frame is not None]
+        stage.rows = len(data)
+    if metrics is not None and resume_cache is not None:
+        metrics.count("resume_cache_hits", resume_cache.hits)
+        metrics.count("resume_cache_misses", resume_cache.misses)
+    if not frames:
+        return pd.DataFrame(columns=[COHORT_COLUMN, *IDENTITY_COLUMNS, "Link", "Username"])
+    return pd.concat(frames, ignore_index=True)
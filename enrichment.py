@@ -0,0 +1,231 @@
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from metrics import in_run_context
+
+# Defaults for the profile enrichment engine; tune to what the account tolerates
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 0.5  # get_profile calls per second, averaged
+DEFAULT_BURST = 3
+DEFAULT_MAX_RETRIES = 4
+BASE_BACKOFF = 5.0  # seconds
+MAX_BACKOFF = 120.0  # seconds
+
+THROTTLE_STATUS_CODES = {429, 999}
+THROTTLE_MARKERS = ("too many requests", "throttl", "rate limit")
+TRANSIENT_STATUS_CODES = {500, 502, 503, 504}
+# linkedin_api returns {} for any refused request: one empty profile is a
+# private, removed or mistyped profile, but this many in a row for different
+# usernames mean LinkedIn is refusing every request
+EMPTY_PROFILE_STREAK = 3
+
+
+class ProfileRefused(Exception):
+    """get_profile returned empty profiles for EMPTY_PROFILE_STREAK usernames in a row."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Every worker takes a token before calling the
+    API, and a throttling response pauses the whole bucket, not just one worker.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    wait = self._paused_until - now
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+            self._updated = self._paused_until
+
+
+class EnrichmentStats:
+    def __init__(self):
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.throttled = 0
+        self.attempts = {}
+        self._empty_streak = set()
+        self._lock = threading.Lock()
+
+    def record(self, username, attempts, failed):
+        with self._lock:
+            self.completed += 1
+            self.failed += int(failed)
+            self.retries += attempts - 1
+            self.attempts[username] = attempts
+
+    def record_throttle(self):
+        with self._lock:
+            self.throttled += 1
+
+    def record_empty(self, username):
+        """Counts an empty profile; returns how many usernames in a row got one."""
+        with self._lock:
+            self._empty_streak.add(username)
+            return len(self._empty_streak)
+
+    def record_profile(self):
+        with self._lock:
+            self._empty_streak.clear()
+
+
+def is_throttling_error(error):
+    # Behind a 999 LinkedIn answers with an HTML page, which is not JSON
+    if isinstance(error, (ProfileRefused, json.JSONDecodeError, requests.exceptions.JSONDecodeError)):
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) in THROTTLE_STATUS_CODES:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+
+def is_transient_error(error):
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) in TRANSIENT_STATUS_CODES
+
+
+def backoff_delay(attempt):
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt))
+
+
+def format_experience(experience_data):
+    if not experience_data:
+        return "No experience data found."
+    return "\n".join(
+        [
+            f"Company: {exp.get('companyName', 'N/A')}, Title: {exp.get('title', 'N/A')}, "
+            f"Start Date: {exp.get('timePeriod', {}).get('startDate', {}).get('month', 'N/A')} "
+            f"{exp.get('timePeriod', {}).get('startDate', {}).get('year', 'N/A')}, "
+            f"End Date: {exp.get('timePeriod', {}).get('endDate', {}).get('month', 'Present')} "
+            f"{exp.get('timePeriod', {}).get('endDate', {}).get('year', 'N/A')}"
+            for exp in experience_data
+        ]
+    )
+
+
+def fetch_experience(api, username, bucket, stats, max_retries=DEFAULT_MAX_RETRIES, cache=None):
+    """
+    Returns the raw experience list for one profile, retrying throttled and
+    transient failures with backoff. Gives None once retries run out, or at
+    once for any other error. An empty profile gives [] (no experience),
+    unless empty profiles for several usernames in a row show that LinkedIn
+    is refusing requests; then it is throttling.
+    Fresh entries in the profile cache are used without calling the API.
+    """
+    if cache is not None:
+        experience_data = cache.get(username)
+        if experience_data is not None:
+            return experience_data
+
+    attempt = 0
+    while True:
+        attempt += 1
+        bucket.acquire()
+        try:
+            profile = api.get_profile(username)
+            if not profile:
+                if stats.record_empty(username) >= EMPTY_PROFILE_STREAK:
+                    raise ProfileRefused(f"LinkedIn returned empty profiles for {EMPTY_PROFILE_STREAK} usernames in a row")
+                # Not cached: it may also be the first refusal of a lockout
+                stats.record(username, attempt, failed=False)
+                return []
+            stats.record_profile()
+            stats.record(username, attempt, failed=False)
+            experience_data = profile.get("experience", [])
+            if cache is not None:
+                cache.put(username, experience_data)
+            return experience_data
+        except Exception as e:
+            throttled = is_throttling_error(e)
+            if attempt > max_retries or not (throttled or is_transient_error(e)):
+                logging.warning(f"API failed for {username} after {attempt} attempts: {e}")
+                stats.record(username, attempt, failed=True)
+                return None
+
+            delay = backoff_delay(attempt)
+            if throttled:
+                stats.record_throttle()
+                bucket.pause(delay)
+            logging.warning(f"API failed for {username} (attempt {attempt}), retrying in {delay:.1f}s: {e}")
+            time.sleep(delay)
+
+
+def _enrich_row(api, row, bucket, stats, max_retries, cache):
+    username = row["Username"]
+    experience_data = None
+    if username != "Invalid URL":
+        experience_data = fetch_experience(api, username, bucket, stats, max_retries, cache)
+        experience_text = format_experience(experience_data) if experience_data is not None else "API Error"
+    else:
+        experience_text = "Invalid URL"
+
+    record = {
+        "Unique ID": row["Unique ID"],
+        "Student Name": row["Student Name"],
+        "Batch Start Date": row["Batch Start Date"],
+        "Batch End Date": row["Batch End Date"],
+        "LinkedIn URL": row["Link"],
+        "Experience": experience_text
+    }
+    return record, experience_data
+
+
+def enrich_profiles(api, df_linkedin, workers=DEFAULT_WORKERS, bucket=None, stats=None,
+                    max_retries=DEFAULT_MAX_RETRIES, cache=None):
+    """
+    Runs get_profile for every row of df_linkedin through a bounded worker
+    pool. Yields (position, record, experience_data) as soon as each profile
+    completes, so callers can stream partial results; position is the row's
+    order in df_linkedin and experience_data the raw "experience" list (None
+    when the profile was not fetched). Pass a ProfileCache to skip profiles fetched recently.
+    """
+    bucket = bucket or TokenBucket()
+    stats = stats if stats is not None else EnrichmentStats()
+    rows = df_linkedin.to_dict("records")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(in_run_context(_enrich_row), api, row, bucket, stats, max_retries, cache): position
+            for position, row in enumerate(rows)
+        }
+        try:
+            for future in as_completed(futures):
+                record, experience_data = future.result()
+                yield futures[future], record, experience_data
+        finally:
+            # Stop queued work if the consumer goes away early
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,122 @@
+import itertools
+import re
+import zipfile
+
+import pandas as pd
+
+from profile_utils import IDENTITY_COLUMNS, LINK_MARKERS
+
+# Large cohort workbooks are streamed: rows are read CHUNK_ROWS at a time and
+# only the identity columns and the cells holding links are kept, so memory
+# follows the number of students rather than the size of the grid.
+CHUNK_ROWS = 5000
+PREVIEW_ROWS = 100
+LINK_PATTERN = re.compile(LINK_MARKERS)
+
+
+def header_names(header):
+    # Same names as pd.read_excel: "Unnamed: i" for blank headers, "name.1" for repeats
+    names, seen = [], {}
+    for position, value in enumerate(header):
+        name = str(value).strip() if value is not None and str(value).strip() else f"Unnamed: {position}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def project_rows(rows, names):
+    """
+    One chunk of raw rows -> a frame with the identity columns and, for any
+    other column, only the cells containing a LinkedIn or Drive link.
+    """
+    identity = [position for position, name in enumerate(names) if name in IDENTITY_COLUMNS]
+    columns = {names[position]: [row[position] if position < len(row) else None for row in rows]
+               for position in identity}
+    links = {}
+    for offset, row in enumerate(rows):
+        for position, value in enumerate(row):
+            if isinstance(value, str) and position not in identity and LINK_PATTERN.search(value):
+                links.setdefault(position, {})[offset] = value
+
+    frame = pd.DataFrame(columns, index=pd.RangeIndex(len(rows)))
+    for position in sorted(links):
+        frame[names[position]] = pd.Series(links[position], dtype=object).reindex(frame.index)
+    return frame
+
+
+def _blank(row):
+    return all(value is None or value == "" for value in row)
+
+
+def _without_trailing_blanks(rows):
+    # Formatted but empty rows at the end of a sheet are dropped, as pd.read_excel does
+    pending = []
+    for row in rows:
+        if _blank(row):
+            pending.append(row)
+            continue
+        yield from pending
+        pending = []
+        yield row
+
+
+def _xlsx_rows(excel_file):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _legacy_rows(excel_file):
+    # .xls has no streaming reader; it is parsed whole, then projected like .xlsx
+    frame = pd.read_excel(excel_file, header=None, dtype=object)
+    yield from frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+
+
+def read_excel_projected(excel_file, chunk_rows=CHUNK_ROWS, preview_rows=PREVIEW_ROWS):
+    """
+    Streams the first worksheet of a workbook (a path or file-like object)
+    with openpyxl in read-only mode, chunk_rows rows at a time, keeping only
+    what extract_stage needs (see project_rows).
+
+    Returns (data, preview, total_rows); preview is the first preview_rows
+    rows with every column, for display.
+    """
+    if hasattr(excel_file, "seek"):
+        excel_file.seek(0)
+    is_xlsx = zipfile.is_zipfile(excel_file)
+    if hasattr(excel_file, "seek"):
+        excel_file.seek(0)
+    rows = _xlsx_rows(excel_file) if is_xlsx else _legacy_rows(excel_file)
+
+    try:
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame(), pd.DataFrame(), 0
+        names = header_names(header)
+        body = _without_trailing_blanks(rows)
+
+        chunks, preview_cells, total_rows = [], [], 0
+        while True:
+            chunk = list(itertools.islice(body, chunk_rows))
+            if not chunk:
+                break
+            if len(preview_cells) < preview_rows:
+                preview_cells.extend(chunk[:preview_rows - len(preview_cells)])
+            chunks.append(project_rows(chunk, names))
+            total_rows += len(chunk)
+    finally:
+        rows.close()
+
+    preview = pd.DataFrame([list(row) + [None] * (len(names) - len(row)) for row in preview_cells], columns=names)
+    data = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=names)
+    # Column order as in the workbook, whichever chunk first had a link in it
+    data = data[[name for name in names if name in data.columns]]
+    return data, preview, total_rows
@@ -0,0 +1,134 @@
+import glob
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+EXPERIENCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "experience_history")
+
+# Long-form experience: one row per position held, indexed by the report row
+# ("Record") it belongs to. Position 0 is the most recent entry on the profile.
+EXPERIENCE_COLUMNS = ["Unique ID", "LinkedIn URL", "Position", "Company", "Title", "Start", "End"]
+CATEGORY_COLUMNS = ["Company", "Title"]
+
+
+def _months(years, months):
+    # LinkedIn dates without a month (or year) cannot be placed in a batch window
+    parts = pd.DataFrame({"year": years, "month": months, "day": 1}, dtype=float)
+    return pd.to_datetime(parts, errors="coerce").dt.to_period("M")
+
+
+def build_experience_table(report, experience_payloads):
+    """
+    Builds the long-form experience table for a scrape.
+
+    report is the scraped frame (one row per student URL) and
+    experience_payloads the raw get_profile "experience" list for each of its
+    rows, aligned with report.index (None when the profile was not fetched).
+    """
+    records, positions, companies, titles = [], [], [], []
+    start_years, start_months, end_years, end_months = [], [], [], []
+    for record, experience_data in zip(report.index, experience_payloads):
+        for position, exp in enumerate(experience_data or []):
+            time_period = exp.get("timePeriod") or {}
+            start_date = time_period.get("startDate") or {}
+            end_date = time_period.get("endDate") or {}
+            records.append(record)
+            positions.append(position)
+            companies.append(exp.get("companyName"))
+            titles.append(exp.get("title"))
+            start_years.append(start_date.get("year"))
+            start_months.append(start_date.get("month"))
+            end_years.append(end_date.get("year"))
+            end_months.append(end_date.get("month"))
+
+    index = pd.Index(records, name="Record")
+    table = pd.DataFrame({
+        "Unique ID": report.loc[records, "Unique ID"].to_numpy() if records else [],
+        "LinkedIn URL": report.loc[records, "LinkedIn URL"].to_numpy() if records else [],
+        "Position": np.array(positions, dtype="int16"),
+        "Company": pd.Categorical(companies),
+        "Title": pd.Categorical(titles),
+    }, index=index)
+    table["Start"] = _months(start_years, start_months).to_numpy()
+    table["End"] = _months(end_years, end_months).to_numpy()
+    return table[EXPERIENCE_COLUMNS]
+
+
+def experience_lines(table):
+    """Formats each position the way the report's "Company N" cells show it."""
+    def month_year(periods, missing):
+        text = periods.dt.month.astype("Int64").astype(str) + " " + periods.dt.year.astype("Int64").astype(str)
+        return text.where(periods.notna(), missing)
+
+    return (
+        "Company: " + table["Company"].astype(object).fillna("N/A").astype(str)
+        + ", Title: " + table["Title"].astype(object).fillna("N/A").astype(str)
+        + ", Start Date: " + month_year(table["Start"], "N/A N/A")
+        + ", End Date: " + month_year(table["End"], "Present N/A")
+    )
+
+
+def company_columns(report, table):
+    """
+    Wide "Company 1..N" view of the experience table for display and CSV
+    export, with the report's placeholders for students without experience.
+    """
+    lines = experience_lines(table).to_frame("line")
+    lines["Position"] = table["Position"].to_numpy()
+    lines = lines[~lines.set_index("Position", append=True).index.duplicated()]
+    wide = lines.set_index("Position", append=True)["line"].unstack("Position")
+    wide = wide.reindex(report.index)
+    wide.columns = [f"Company {position + 1}" for position in wide.columns]
+    if "Company 1" not in wide.columns:
+        wide["Company 1"] = np.nan
+
+    # Students with no positions keep the placeholders the report always used
+    empty = wide["Company 1"].isna()
+    no_data = empty & (report["Experience"] == "No experience data found.")
+    wide.loc[empty, "Company 1"] = report.loc[empty, "Experience"]
+    wide.loc[no_data, "Company 1"] = "No Experience Data"
+    if no_data.any():
+        if "Company 2" not in wide.columns:
+            wide["Company 2"] = np.nan
+        wide.loc[no_data, "Company 2"] = "No Experience Data found"
+    return wide
+
+
+def save_experience_table(table, path=None):
+    """Writes the table to Parquet (a new timestamped file under EXPERIENCE_DIR by default)."""
+    if path is None:
+        os.makedirs(EXPERIENCE_DIR, exist_ok=True)
+        path = os.path.join(EXPERIENCE_DIR, f"experience_{datetime.now():%Y%m%d_%H%M%S}.parquet")
+    table.to_parquet(path, engine="pyarrow")
+    return path
+
+
+def experience_table_bytes(table):
+    # In-memory Parquet for download buttons
+    return table.to_parquet(engine="pyarrow")
+
+
+def load_experience_history(directory=EXPERIENCE_DIR, columns=None):
+    """
+    Loads every saved run as one frame with a "Run" column. Company and Title
+    stay categorical across runs, which keeps multi-cohort history small.
+    """
+    frames = []
+    for path in sorted(glob.glob(os.path.join(directory, "experience_*.parquet"))):
+        frame = pd.read_parquet(path, engine="pyarrow", columns=columns)
+        frame["Run"] = os.path.basename(path)[len("experience_"):-len(".parquet")]
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=EXPERIENCE_COLUMNS + ["Run"])
+
+    for col in CATEGORY_COLUMNS:
+        if all(col in frame.columns for frame in frames):
+            categories = union_categoricals([frame[col] for frame in frames]).categories
+            for frame in frames:
+                frame[col] = frame[col].cat.set_categories(categories)
+    history = pd.concat(frames)
+    history["Run"] = history["Run"].astype("category")
+    return history
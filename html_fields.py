@@ -0,0 +1,99 @@
+import soupsieve as sv
+from bs4 import BeautifulSoup
+
+# lxml parses and matches in C; CSS selectors are translated to XPath once by
+# cssselect. Without either package the same specs run on BeautifulSoup.
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+    from lxml.etree import _Element as LxmlElement
+except ImportError:
+    CSSSelector = None
+    LxmlElement = ()
+
+BACKENDS = ("lxml", "html.parser")
+DEFAULT_BACKEND = "lxml" if CSSSelector is not None else "html.parser"
+
+
+def parse_html(markup, backend=DEFAULT_BACKEND):
+    """Parses markup into a root node that Selector and FieldSpec accept."""
+    if backend == "lxml":
+        # Always a whole document, so a lone fragment root is still searchable
+        return lxml.html.document_fromstring(markup if markup and markup.strip() else "<html></html>")
+    return BeautifulSoup(markup, "html.parser")
+
+
+def _is_lxml(node):
+    return isinstance(node, LxmlElement)
+
+
+def node_text(node, separator=None):
+    """
+    Text of node and its descendants. With a separator the stripped text
+    pieces are joined by it (like bs4's get_text(separator, strip=True));
+    without one they are concatenated and the result stripped.
+    """
+    pieces = node.itertext() if _is_lxml(node) else node.strings
+    if separator is None:
+        return "".join(pieces).strip()
+    return separator.join(piece.strip() for piece in pieces if piece.strip())
+
+
+class Selector:
+    """A CSS selector compiled for both backends."""
+
+    def __init__(self, css):
+        self.css = css
+        self._soup = sv.compile(css)
+        self._lxml = CSSSelector(css, translator="html") if CSSSelector is not None else None
+
+    def select(self, node):
+        if _is_lxml(node):
+            return [match for match in self._lxml(node) if match is not node]
+        return self._soup.select(node)
+
+    def select_one(self, node):
+        matches = self.select(node) if _is_lxml(node) else [self._soup.select_one(node)]
+        return matches[0] if matches and matches[0] is not None else None
+
+
+class Field:
+    """
+    One output field: the first element matching selector, read as an
+    attribute or as text, then passed through post. Missing elements give
+    default; so do blank values unless keep_blank.
+    """
+
+    def __init__(self, selector, attr=None, separator=None, post=None, default=None, keep_blank=True):
+        self.selector = Selector(selector)
+        self.attr = attr
+        self.separator = separator
+        self.post = post
+        self.default = default
+        self.keep_blank = keep_blank
+
+    def extract(self, node):
+        match = self.selector.select_one(node)
+        if match is None:
+            return self.default
+        value = match.get(self.attr) if self.attr else node_text(match, self.separator)
+        if value is None or (not value and not self.keep_blank):
+            return self.default
+        return self.post(value) if self.post is not None else value
+
+
+class FieldSpec:
+    """
+    Field name -> Field, compiled once at import. extract() reads every field
+    of one node; extract_all() does so for each node matching root.
+    """
+
+    def __init__(self, fields, root=None):
+        self.fields = fields
+        self.root = Selector(root) if root else None
+
+    def extract(self, node):
+        return {name: field.extract(node) for name, field in self.fields.items()}
+
+    def extract_all(self, node):
+        return [self.extract(match) for match in self.root.select(node)]
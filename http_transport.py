@@ -0,0 +1,254 @@
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+HTTP_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "http_cache.sqlite3")
+DEFAULT_TIMEOUT = (5, 30)  # connect, read seconds
+DEFAULT_POOL_SIZE = 16  # keep-alive connections per host
+DEFAULT_MAX_RETRIES = 3
+BASE_BACKOFF = 1.0  # seconds
+MAX_BACKOFF = 30.0  # seconds
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# After this many failed requests in a row a host is not called for BREAKER_COOLDOWN seconds
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60.0  # seconds
+# Stored responses unused for this long are dropped when the cache is opened
+CACHE_MAX_AGE = 7 * 86400  # seconds
+
+# Seconds a stored response is served without asking the server again; after
+# that it is revalidated with If-None-Match / If-Modified-Since. Endpoints
+# mapped to None (or not listed) are never stored.
+ENDPOINT_TTLS = {
+    "linkedin_list": 10 * 60,
+    "linkedin_job": 24 * 3600,
+    "drive_resume": None,  # ResumeCache keeps the links found in each file
+}
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Per-host failure counter. A host that failed threshold times in a row is
+    refused for cooldown seconds; after that one more failure refuses it again
+    and a success closes the circuit.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = {}
+        self._open_until = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host):
+        with self._lock:
+            return time.monotonic() >= self._open_until.get(host, 0.0)
+
+    def success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+
+    def failure(self, host):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold:
+                self._open_until[host] = time.monotonic() + self.cooldown
+                logging.warning(f"{host} failed {failures} times in a row; pausing requests for {self.cooldown:.0f}s")
+
+
+class ResponseCache:
+    """Successful GET responses on disk, keyed by URL, with their validators."""
+
+    def __init__(self, path=HTTP_CACHE_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, endpoint TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL, "
+            "body BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - CACHE_MAX_AGE,))
+        self._conn.commit()
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, stored_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2], row[3]
+
+    def put(self, url, endpoint, response):
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, endpoint, status, headers, body, stored_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, endpoint, response.status_code, json.dumps(headers), response.content, time.time()),
+            )
+            self._conn.commit()
+
+    def touch(self, url):
+        # A 304 makes the stored response fresh again
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _stored_response(url, stored):
+    status, headers, body, _ = stored
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+def _retry_after(response):
+    # Retry-After is either seconds or an HTTP date
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, response=None):
+    delay = _retry_after(response)
+    if delay is None:
+        delay = BASE_BACKOFF * (2 ** attempt) * random.uniform(0.8, 1.2)
+    return min(max(delay, 0.0), MAX_BACKOFF)
+
+
+class Transport:
+    """
+    The one HTTP client every scraper goes through: a keep-alive connection
+    pool per host, default timeouts, retries with backoff on 429/5xx and
+    connection errors, a per-host circuit breaker, and an on-disk response
+    cache with per-endpoint TTLs (ENDPOINT_TTLS) and conditional revalidation.
+    Thread-safe. hits / revalidated / misses count cache outcomes.
+    """
+
+    def __init__(self, cache_path=HTTP_CACHE_PATH, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, ttls=None, breaker=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.ttls = ENDPOINT_TTLS if ttls is None else ttls
+        self.breaker = breaker or CircuitBreaker()
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        # pool_connections: hosts kept alive at once; pool_maxsize: connections per host
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _count(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def get(self, url, endpoint=None, timeout=None):
+        """
+        GETs url. Responses of endpoints with a TTL are served from the cache
+        while fresh and revalidated once stale. Raises requests exceptions
+        (CircuitOpenError while the host's circuit is open) when every
+        attempt failed; a final 429/5xx response is returned as is.
+        """
+        ttl = self.ttls.get(endpoint) if self.cache is not None else None
+        stored = self.cache.get(url) if ttl is not None else None
+        if stored is not None and time.time() - stored[3] < ttl:
+            self._count("hits")
+            return _stored_response(url, stored)
+
+        headers = {}
+        if stored is not None:
+            if "ETag" in stored[1]:
+                headers["If-None-Match"] = stored[1]["ETag"]
+            if "Last-Modified" in stored[1]:
+                headers["If-Modified-Since"] = stored[1]["Last-Modified"]
+
+        response = self._send(url, headers, timeout or self.timeout)
+        if response.status_code == 304 and stored is not None:
+            self._count("revalidated")
+            self.cache.touch(url)
+            return _stored_response(url, stored)
+        self._count("misses")
+        if response.status_code == 200 and ttl is not None:
+            self.cache.put(url, endpoint, response)
+        return response
+
+    def _send(self, url, headers, timeout):
+        host = urlparse(url).netloc
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow(host):
+                raise CircuitOpenError(f"Requests to {host} are paused after repeated failures")
+            try:
+                response = self.session.get(url, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.breaker.failure(host)
+                # No point waiting to retry once the circuit has opened
+                if attempt == self.max_retries or not self.breaker.allow(host):
+                    raise
+                logging.warning(f"GET {url} failed ({e}); retrying")
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES:
+                self.breaker.success(host)
+                return response
+            self.breaker.failure(host)
+            if attempt == self.max_retries or not self.breaker.allow(host):
+                return response
+            time.sleep(backoff_delay(attempt, response))
+
+
+# One transport per process, so connections and the cache survive Streamlit reruns
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = Transport()
+        return _transport
+
+
+def set_transport(transport):
+    """Replaces the shared transport (e.g. one without the on-disk cache for benchmarks)."""
+    global _transport
+    with _transport_lock:
+        _transport = transport
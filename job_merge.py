@@ -0,0 +1,162 @@
+import logging
+import queue
+import re
+import threading
+
+from utils import iter_linkedin_jobs, iter_naukri_jobs, job_id_of
+
+# One schema for postings from every platform
+UNIFIED_COLUMNS = ["Platform", "Job ID", "Job Title", "Company Name", "Location", "Experience Needed",
+                   "Salary", "Posted", "Job Description", "Apply Link"]
+# Platform column -> unified column
+COLUMN_MAPS = {
+    "linkedin": {"Job Title": "Job Title", "Company Name": "Company Name", "Location": "Location",
+                 "time_posted": "Posted", "job_description": "Job Description", "Apply Link": "Apply Link"},
+    "naukri": {"Job Role": "Job Title", "Company Name": "Company Name", "Location": "Location",
+               "Experience Needed": "Experience Needed", "Salary": "Salary",
+               "Job Description": "Job Description", "Vacancy Link": "Apply Link"},
+}
+PLATFORM_NAMES = {"linkedin": "LinkedIn", "naukri": "Naukri"}
+MISSING_VALUES = {None, "", "Not Available", "Not Disclosed"}
+
+# Two descriptions sharing at least this share of word 3-grams are one posting
+DESCRIPTION_SIMILARITY = 0.5
+SHINGLE_SIZE = 3
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# Legal and filler words that differ between how sites list one employer
+COMPANY_NOISE = {"pvt", "private", "ltd", "limited", "inc", "llp", "llc", "corp", "corporation",
+                 "co", "company", "india", "technologies", "technology", "solutions", "services", "the"}
+CITY_ALIASES = {"bangalore": "bengaluru", "gurgaon": "gurugram", "bombay": "mumbai", "madras": "chennai",
+                "calcutta": "kolkata", "trivandrum": "thiruvananthapuram", "new delhi": "delhi"}
+# Region words that say nothing about where the job is
+LOCATION_NOISE = {"india", "remote", "hybrid", "karnataka", "maharashtra", "telangana", "tamil nadu",
+                  "haryana", "uttar pradesh", "west bengal", "kerala", "gujarat", "delhi ncr", "ncr"}
+
+
+def normalize_posting(platform, job):
+    """A posting from iter_linkedin_jobs / iter_naukri_jobs in the unified schema."""
+    posting = dict.fromkeys(UNIFIED_COLUMNS, "Not Available")
+    posting["Platform"] = PLATFORM_NAMES[platform]
+    posting["Job ID"] = job_id_of(platform, job)
+    for source, target in COLUMN_MAPS[platform].items():
+        if job.get(source) is not None:
+            posting[target] = job[source]
+    return posting
+
+
+def _words(text):
+    return WORD_PATTERN.findall(str(text).lower())
+
+
+def company_key(company):
+    return " ".join(word for word in _words(company) if word not in COMPANY_NOISE)
+
+
+def title_key(title):
+    return " ".join(_words(title))
+
+
+def location_cities(location):
+    # "Bangalore/Bengaluru, Karnataka, India" -> {"bengaluru"}
+    cities = set()
+    for part in re.split(r"[,/;()|]|\s-\s", str(location).lower()):
+        part = " ".join(_words(part))
+        if part and part not in LOCATION_NOISE:
+            cities.add(CITY_ALIASES.get(part, part))
+    return cities
+
+
+def description_shingles(description):
+    if description in MISSING_VALUES:
+        return None
+    words = _words(description)
+    return {tuple(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))}
+
+
+def _similar(shingles, other, threshold=DESCRIPTION_SIMILARITY):
+    return len(shingles & other) / len(shingles | other) >= threshold
+
+
+def is_duplicate(cities, shingles, other_cities, other_shingles, threshold=DESCRIPTION_SIMILARITY):
+    """
+    Whether two postings with the same company + title fingerprint are one
+    role. With both descriptions, their locations must not name different
+    cities and the descriptions must be near-duplicates. A posting without a
+    description can only be matched by naming exactly the same cities.
+    """
+    if shingles is None or other_shingles is None:
+        return bool(cities) and cities == other_cities
+    if cities and other_cities and not cities & other_cities:
+        return False
+    return _similar(shingles, other_shingles, threshold)
+
+
+class JobDeduper:
+    """
+    Drops postings of a role already kept from another platform. Candidates
+    share a normalized company + title fingerprint; see is_duplicate for when
+    two of them are one posting. Postings from the same platform are never
+    merged: their job ids already tell them apart.
+    """
+
+    def __init__(self, threshold=DESCRIPTION_SIMILARITY):
+        self.threshold = threshold
+        self.dropped = 0
+        self._kept = {}
+
+    def add(self, posting):
+        """Returns True if posting is new and was kept, False for a duplicate."""
+        fingerprint = (company_key(posting["Company Name"]), title_key(posting["Job Title"]))
+        cities = location_cities(posting["Location"])
+        shingles = description_shingles(posting["Job Description"])
+        for platform, kept_cities, kept_shingles in self._kept.get(fingerprint, []):
+            if platform != posting["Platform"] and is_duplicate(cities, shingles, kept_cities, kept_shingles, self.threshold):
+                self.dropped += 1
+                return False
+        self._kept.setdefault(fingerprint, []).append((posting["Platform"], cities, shingles))
+        return True
+
+
+def _drain(platform, jobs, results, stop):
+    try:
+        for job in jobs:
+            if stop.is_set():
+                break
+            results.put((platform, job))
+    except Exception as e:
+        logging.warning(f"{PLATFORM_NAMES[platform]} scrape failed: {e}")
+    finally:
+        jobs.close()
+        results.put((platform, None))  # This platform is finished
+
+
+def iter_all_jobs(job_role, num_jobs=10, store=None, deduper=None):
+    """
+    Scrapes LinkedIn and Naukri at the same time, up to num_jobs each, and
+    yields their postings in the unified schema as they arrive, minus
+    cross-platform duplicates. A platform that fails is logged and skipped.
+    """
+    deduper = deduper if deduper is not None else JobDeduper()
+    scrapers = {
+        "linkedin": iter_linkedin_jobs(job_role, num_jobs=num_jobs, store=store),
+        "naukri": iter_naukri_jobs(job_role, num_jobs=num_jobs, store=store),
+    }
+    results = queue.Queue()
+    stop = threading.Event()
+    threads = [threading.Thread(target=_drain, args=(platform, jobs, results, stop), daemon=True)
+               for platform, jobs in scrapers.items()]
+    for thread in threads:
+        thread.start()
+    try:
+        running = len(threads)
+        while running:
+            platform, job = results.get()
+            if job is None:
+                running -= 1
+                continue
+            posting = normalize_posting(platform, job)
+            if deduper.add(posting):
+                yield posting
+    finally:
+        stop.set()
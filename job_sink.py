@@ -0,0 +1,60 @@
+import csv
+import json
+import os
+import uuid
+from datetime import datetime
+
+# Scraper output files live here, one per session and platform
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_exports")
+SINK_FORMATS = ("csv", "jsonl")
+
+
+def new_session_id():
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def session_output_path(platform, session_id=None, fmt="csv", directory=OUTPUT_DIR):
+    """File name unique to one session, e.g. job_exports/linkedin_jobs_20240101-120000-1a2b3c4d.csv"""
+    return os.path.join(directory, f"{platform.lower()}_jobs_{session_id or new_session_id()}.{fmt}")
+
+
+class JobSink:
+    """
+    Appends postings to a CSV or JSON-lines file as they are scraped, so a
+    long scrape never holds more than one posting and the file is readable
+    while it grows. The format follows the file extension unless given.
+    """
+
+    def __init__(self, path, fmt=None, fieldnames=None):
+        self.path = path
+        self.fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+        if self.fmt not in SINK_FORMATS:
+            raise ValueError(f"Unsupported job sink format: {self.fmt}")
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.count = 0
+        self._writer = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "w", newline="", encoding="utf-8")
+
+    def write(self, job):
+        if self.fmt == "jsonl":
+            self._file.write(json.dumps(job, ensure_ascii=False) + "\n")
+        else:
+            if self._writer is None:
+                # Without a fixed schema the first posting decides the columns
+                self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames or list(job), extrasaction="ignore")
+                self._writer.writeheader()
+            self._writer.writerow(job)
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if self.fmt == "csv" and self._writer is None and self.fieldnames:
+            csv.DictWriter(self._file, fieldnames=self.fieldnames).writeheader()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
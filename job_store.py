@@ -0,0 +1,98 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+JOB_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_store.sqlite3")
+
+
+class JobStore:
+    """
+    Every posting the scrapers have fetched, keyed by platform and job id,
+    with the time it was first and last seen in a listing. Scrapers skip the
+    detail fetch for postings already stored, and each scrape is recorded as
+    a run so exports can return only what is new since the previous run.
+    """
+
+    def __init__(self, path=JOB_STORE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "platform TEXT NOT NULL, job_id TEXT NOT NULL, data TEXT NOT NULL, "
+            "first_seen REAL NOT NULL, last_seen REAL NOT NULL, PRIMARY KEY (platform, job_id))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "platform TEXT NOT NULL, query TEXT NOT NULL, started_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_first_seen ON jobs (platform, first_seen)")
+        self._conn.commit()
+
+    def start_run(self, platform, query):
+        """
+        Records a scrape of query on platform. Returns (started_at, previous),
+        previous being the start of the last run of the same query or None.
+        """
+        started_at = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(started_at) FROM runs WHERE platform = ? AND query = ?", (platform, query.lower())
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO runs (platform, query, started_at) VALUES (?, ?, ?)", (platform, query.lower(), started_at)
+            )
+            self._conn.commit()
+        return started_at, row[0]
+
+    def seen(self, platform, job_ids):
+        """
+        Returns {job_id: posting} for the ids already stored and marks them
+        as seen now. Ids missing from the result still need a detail fetch.
+        """
+        job_ids = [str(job_id) for job_id in job_ids]
+        if not job_ids:
+            return {}
+        placeholders = ", ".join("?" * len(job_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id, data FROM jobs WHERE platform = ? AND job_id IN ({placeholders})",
+                [platform, *job_ids],
+            ).fetchall()
+            self._conn.execute(
+                f"UPDATE jobs SET last_seen = ? WHERE platform = ? AND job_id IN ({placeholders})",
+                [time.time(), platform, *job_ids],
+            )
+            self._conn.commit()
+            known = {job_id: json.loads(data) for job_id, data in rows}
+            self.hits += len(known)
+            self.misses += len(set(job_ids)) - len(known)
+        return known
+
+    def put(self, platform, job_id, posting):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (platform, job_id, data, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (platform, job_id) DO UPDATE SET data = excluded.data, last_seen = excluded.last_seen",
+                (platform, str(job_id), json.dumps(posting), now, now),
+            )
+            self._conn.commit()
+
+    def new_since(self, platform, since, job_ids=None):
+        """Postings first seen at or after since, optionally limited to job_ids, oldest first."""
+        query = "SELECT job_id, data FROM jobs WHERE platform = ? AND first_seen >= ? ORDER BY first_seen"
+        with self._lock:
+            rows = self._conn.execute(query, (platform, since or 0)).fetchall()
+        if job_ids is not None:
+            job_ids = {str(job_id) for job_id in job_ids}
+            rows = [row for row in rows if row[0] in job_ids]
+        return [json.loads(data) for _, data in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
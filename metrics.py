@@ -0,0 +1,197 @@
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Run summaries and the Prometheus textfile go here unless PLACEMENT_METRICS_DIR
+# points elsewhere (e.g. the node exporter's --collector.textfile.directory)
+METRICS_DIR = os.environ.get("PLACEMENT_METRICS_DIR",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), "metrics"))
+PROMETHEUS_FILE = "placement_pipeline.prom"
+SUMMARY_FILE = "last_run.json"
+
+
+# Runs whose instrumented() block the current code is in. A session gets one
+# response hook for good and each response is recorded by the runs in this
+# context only, so runs sharing a session (e.g. the process-wide HTTP
+# transport) do not count each other's requests.
+_active_runs = contextvars.ContextVar("active_runs", default=())
+_hooked_sessions_lock = threading.Lock()
+
+
+def _record_response(response, *args, **kwargs):
+    for metrics in _active_runs.get():
+        metrics._on_response(response)
+
+
+def in_run_context(fn):
+    """
+    fn wrapped to run in the caller's context, for work handed to a thread
+    pool: requests it makes are recorded by the caller's runs.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+class StageTimer:
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+
+
+class RunMetrics:
+    """
+    Measurements of one pipeline run: wall time and rows per stage, HTTP
+    requests per host (count, latency, status codes) and event counters such
+    as cache hits, retries and failures. Thread-safe; sessions passed to
+    instrumented() report the responses of this run's requests.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self.stages = {}
+        self.hosts = {}
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Times the block as stage name; set .rows on the yielded timer to record throughput."""
+        timer = StageTimer(name)
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            self.record_stage(name, time.perf_counter() - start, timer.rows)
+
+    def record_stage(self, name, seconds, rows=None):
+        with self._lock:
+            self.stages[name] = {"seconds": seconds, "rows": rows}
+            self.updated_at = time.time()
+
+    def record_request(self, host, seconds, status):
+        with self._lock:
+            entry = self.hosts.setdefault(host, {"requests": 0, "latency_sum": 0.0, "latency_max": 0.0, "status": Counter()})
+            entry["requests"] += 1
+            entry["latency_sum"] += seconds
+            entry["latency_max"] = max(entry["latency_max"], seconds)
+            entry["status"][str(status)] += 1
+            self.updated_at = time.time()
+
+    def count(self, event, n=1):
+        with self._lock:
+            self.counters[event] += n
+            self.updated_at = time.time()
+
+    def _on_response(self, response, *args, **kwargs):
+        self.record_request(urlparse(response.url).hostname or "unknown",
+                            response.elapsed.total_seconds(), response.status_code)
+
+    @contextmanager
+    def instrumented(self, session):
+        """
+        Records the responses of a requests session received by this thread
+        (and by work it hands off through in_run_context) during the block.
+        """
+        if session is None:
+            yield session
+            return
+        with _hooked_sessions_lock:
+            if _record_response not in session.hooks["response"]:
+                session.hooks["response"].append(_record_response)
+        token = _active_runs.set(_active_runs.get() + (self,))
+        try:
+            yield session
+        finally:
+            _active_runs.reset(token)
+
+    def summary(self):
+        with self._lock:
+            stages = {
+                name: {**stage, "rows_per_second": round(stage["rows"] / stage["seconds"], 2)
+                       if stage["rows"] and stage["seconds"] else None}
+                for name, stage in self.stages.items()
+            }
+            hosts = {
+                host: {
+                    "requests": entry["requests"],
+                    "latency_mean": entry["latency_sum"] / entry["requests"],
+                    "latency_max": entry["latency_max"],
+                    "status": dict(entry["status"]),
+                }
+                for host, entry in self.hosts.items()
+            }
+            return {
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+                "stages": stages,
+                "http": hosts,
+                "counters": dict(self.counters),
+            }
+
+    def to_prometheus(self):
+        """The run as Prometheus text exposition format (all gauges: the file holds the latest run)."""
+        summary = self.summary()
+        lines = []
+
+        def metric(name, help_text, samples):
+            if not samples:
+                return
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        stages = summary["stages"].items()
+        metric("placement_stage_duration_seconds", "Wall time of the pipeline stage in the last run.",
+               [({"stage": name}, stage["seconds"]) for name, stage in stages])
+        metric("placement_stage_rows", "Rows processed by the pipeline stage in the last run.",
+               [({"stage": name}, stage["rows"]) for name, stage in stages if stage["rows"] is not None])
+        metric("placement_stage_rows_per_second", "Rows per second of the pipeline stage in the last run.",
+               [({"stage": name}, stage["rows_per_second"]) for name, stage in stages if stage["rows_per_second"]])
+
+        hosts = summary["http"].items()
+        metric("placement_http_requests", "HTTP responses received in the last run, by host and status code.",
+               [({"host": host, "status": status}, n) for host, entry in hosts for status, n in entry["status"].items()])
+        metric("placement_http_request_duration_seconds_mean", "Mean HTTP latency in the last run, by host.",
+               [({"host": host}, round(entry["latency_mean"], 6)) for host, entry in hosts])
+        metric("placement_http_request_duration_seconds_max", "Slowest HTTP response in the last run, by host.",
+               [({"host": host}, round(entry["latency_max"], 6)) for host, entry in hosts])
+        metric("placement_events", "Cache hits and misses, retries and failures in the last run.",
+               [({"event": event}, n) for event, n in summary["counters"].items()])
+        metric("placement_last_run_timestamp_seconds", "Start of the last run, as a Unix timestamp.",
+               [({}, round(self.started_at, 3))])
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory=METRICS_DIR):
+        """Writes the JSON run summary and the Prometheus textfile; returns their paths."""
+        os.makedirs(directory, exist_ok=True)
+        summary_path = os.path.join(directory, SUMMARY_FILE)
+        prometheus_path = os.path.join(directory, PROMETHEUS_FILE)
+        _write_atomic(summary_path, json.dumps(self.summary(), indent=2))
+        _write_atomic(prometheus_path, self.to_prometheus())
+        return summary_path, prometheus_path
+
+
+def _escape(label):
+    return re.sub(r'(["\\])', r"\\\1", str(label)).replace("\n", "\\n")
+
+
+def _write_atomic(path, text):
+    # The node exporter must never read a half-written file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
@@ -0,0 +1,175 @@
+import hashlib
+import logging
+from contextlib import nullcontext
+
+import pandas as pd
+
+from classification import classify_experience_table
+from enrichment import EnrichmentStats, enrich_profiles
+from experience_table import build_experience_table, company_columns, save_experience_table
+from metrics import StageTimer
+from profile_utils import IDENTITY_COLUMNS, drive_file_ids, extract_linkedin_links, string_cells
+from resume_fetch import fetch_resume_links
+
+# Profile pipeline stages: ingest -> extract -> enrich -> classify -> report.
+# Each stage is a plain function of its inputs; run_stage memoizes its output
+# under a content hash of those inputs, so a rerun only recomputes what changed.
+STAGES = ("ingest", "extract", "enrich", "classify", "report")
+
+
+def content_hash(*parts):
+    """Stable hash of DataFrames, Series, bytes and plain values."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            digest.update(repr(list(part.columns) if isinstance(part, pd.DataFrame) else part.name).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        elif isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def run_stage(store, name, key, compute):
+    """
+    Returns store[name]'s output if it was computed for the same key,
+    otherwise runs compute() and remembers the result. store is any dict-like
+    (st.session_state on the page); only the latest key per stage is kept.
+    """
+    entry = store.get(name)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    result = compute()
+    store[name] = (key, result)
+    return result
+
+
+def timed(metrics, name):
+    """metrics.stage(name), or a no-op timer when the caller passed no RunMetrics."""
+    return metrics.stage(name) if metrics is not None else nullcontext(StageTimer(name))
+
+
+# Convert Batch Start Date and Batch End Date to datetime format with only month and year (month as number)
+def convert_to_month_year(df, date_column_name):
+    try:
+        df[date_column_name] = pd.to_datetime(df[date_column_name], errors='coerce').dt.to_period('M').dt.strftime('%m %Y')
+    except Exception as e:
+        logging.warning(f"Error converting {date_column_name}: {e}")
+    return df
+
+
+def extract_stage(data, resume_cache=None, metrics=None, **resume_options):
+    """
+    Sheet rows -> one row per student LinkedIn URL, with month-year batch
+    dates. resume_options (mode, parse_workers, time_budget) go to
+    fetch_resume_links.
+    """
+    with timed(metrics, "extract") as stage:
+        file_ids = drive_file_ids(string_cells(data))
+        with timed(metrics, "extract:resumes") as resumes:
+            resume_links = fetch_resume_links(file_ids, cache=resume_cache, metrics=metrics, **resume_options)
+            resumes.rows = file_ids.nunique()
+        df_linkedin = extract_linkedin_links(data, resume_links)
+        df_linkedin = convert_to_month_year(df_linkedin, "Batch Start Date")
+        df_linkedin = convert_to_month_year(df_linkedin, "Batch End Date")
+        stage.rows = len(data)
+    if metrics is not None and resume_cache is not None:
+        metrics.count("resume_cache_hits", resume_cache.hits)
+        metrics.count("resume_cache_misses", resume_cache.misses)
+    return df_linkedin
+
+
+def profile_groups(df_linkedin):
+    """Positions of df_linkedin's rows grouped by LinkedIn username, in first-seen order."""
+    groups = {}
+    for position, username in enumerate(df_linkedin["Username"]):
+        groups.setdefault(username, []).append(position)
+    return list(groups.values())
+
+
+def row_record(record, row):
+    """
+    An enriched record for another row with the same profile, as the record
+    of row: its identity and link, plus any extra columns (e.g. "Cohort") first.
+    """
+    extra = {column: value for column, value in row.items() if column not in record and column not in ("Link", "Username")}
+    return {**extra, **record, **{column: row[column] for column in IDENTITY_COLUMNS}, "LinkedIn URL": row["Link"]}
+
+
+def enrich_stage(api, df_linkedin, cache=None, on_result=None, metrics=None, **engine_options):
+    """
+    Runs the enrichment engine over df_linkedin, fetching each distinct
+    profile once however many rows link to it. on_result(done, total, records)
+    is called after every completed profile. Returns (records, payloads, stats)
+    in sheet order.
+    """
+    stats = EnrichmentStats()
+    records = [None] * len(df_linkedin)
+    payloads = [None] * len(df_linkedin)
+    groups = profile_groups(df_linkedin)
+    rows = df_linkedin.to_dict("records")
+    unique_profiles = df_linkedin.iloc[[group[0] for group in groups]]
+    # The LinkedIn client's own requests session carries the get_profile calls
+    session = getattr(getattr(api, "client", None), "session", None)
+    with timed(metrics, "enrich") as stage, \
+            (metrics.instrumented(session) if metrics is not None else nullcontext()):
+        for done, (unique_position, record, experience_data) in enumerate(
+                enrich_profiles(api, unique_profiles, stats=stats, cache=cache, **engine_options), start=1):
+            for position in groups[unique_position]:
+                records[position] = row_record(record, rows[position])
+                payloads[position] = experience_data
+            if on_result is not None:
+                on_result(done, len(groups), records)
+        stage.rows = len(records)
+    if metrics is not None:
+        metrics.count("profiles_fetched", stats.completed - stats.failed)
+        metrics.count("profile_failures", stats.failed)
+        metrics.count("profile_retries", stats.retries)
+        metrics.count("profile_throttled", stats.throttled)
+        if cache is not None:
+            metrics.count("profile_cache_hits", cache.hits)
+            metrics.count("profile_cache_misses", cache.misses)
+    return records, payloads, stats
+
+
+# Adds the "Company N" display columns from the experience table and fills gaps
+def process_data(df, experience_df):
+    df = pd.concat([df, company_columns(df, experience_df)], axis=1)
+
+    # Fill any NaN values with "No Experience Data found"
+    df.fillna("No Experience Data found", inplace=True)
+
+    return df
+
+
+# Keeps every run's experience table on disk for multi-cohort history
+def save_experience_history(experience_df):
+    try:
+        save_experience_table(experience_df)
+    except Exception as e:
+        logging.warning(f"Could not save experience table: {e}")
+
+
+def classify_stage(records, payloads, save_history=True, metrics=None):
+    """Enriched records -> (report frame with classification, experience table)."""
+    with timed(metrics, "classify") as stage:
+        scraped_data_df = pd.DataFrame(records)
+        experience_df = build_experience_table(scraped_data_df, payloads)
+        if save_history:
+            save_experience_history(experience_df)
+        scraped_data_df = process_data(scraped_data_df, experience_df)
+
+        # Apply experience classification straight from the experience table
+        scraped_data_df["Experience Classification"] = classify_experience_table(scraped_data_df, experience_df)
+        stage.rows = len(scraped_data_df)
+    return scraped_data_df, experience_df
+
+
+def report_stage(scraped_data_df, metrics=None):
+    """CSV bytes of the placement report."""
+    with timed(metrics, "report") as stage:
+        csv_data = scraped_data_df.to_csv(index=False).encode("utf-8")
+        stage.rows = len(scraped_data_df)
+    return csv_data
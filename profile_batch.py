@@ -0,0 +1,280 @@
+"""
+Headless batch run of the profile pipeline, for cron or a worker box.
+
+    python profile_batch.py --sheet-id <id> --output report.csv
+    python profile_batch.py --excel cohort.xlsx --output report.csv
+    python profile_batch.py --sheet-ids <id> <id> --all-worksheets --output center.csv
+
+Runs extract -> enrich -> classify like the Profile Scraper page. With
+--sheet-ids every listed spreadsheet (every worksheet with --all-worksheets)
+is a cohort; all cohorts share one enrichment run and one report, with a
+Cohort column. A student listed in several cohorts is fetched once. Completed
+profiles are appended to a checkpoint file every --checkpoint-every
+profiles; re-running the same command resumes where the previous run
+stopped. Profiles that failed (e.g. during a throttling lockout, when
+LinkedIn answers with empty profiles) are checkpointed without a payload and
+retried on the next run; --max-consecutive-failures of them in a row stop
+the run. LinkedIn credentials come from --email/--password or the
+LINKEDIN_EMAIL / LINKEDIN_PASSWORD environment variables (.env is read).
+
+Stage timings, LinkedIn requests and cache/retry counts are written as a
+JSON run summary and a Prometheus textfile to --metrics-dir.
+
+Neither Streamlit nor Chrome is imported; LinkedIn and Google clients are
+only created once the run needs them.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+import pandas as pd
+
+from analytics import PlacementAnalytics
+from enrichment import (
+    DEFAULT_BURST, DEFAULT_MAX_RETRIES, DEFAULT_RATE, DEFAULT_WORKERS, EnrichmentStats, TokenBucket, enrich_profiles,
+)
+from metrics import METRICS_DIR, RunMetrics
+from pipeline import classify_stage, content_hash, extract_stage, profile_groups, report_stage, row_record
+from profile_cache import DEFAULT_TTL_DAYS, REFRESH_MODES, ProfileCache
+from resume_fetch import DEFAULT_EXTRACTION_MODE, DEFAULT_PARSE_WORKERS, EXTRACTION_MODES, ResumeCache
+from sheets_sync import sheets_client
+
+DEFAULT_CHECKPOINT_EVERY = 25
+# Exit code for "stopped early, try again later" (EX_TEMPFAIL)
+EXIT_RETRY_LATER = 75
+
+
+def load_sheet(sheet_id, credentials_file):
+    cell_values = sheets_client(credentials_file).open_by_key(sheet_id).sheet1.get_all_values()
+    return pd.DataFrame(cell_values[1:], columns=cell_values[0])
+
+
+def _json_default(value):
+    # numpy scalars from pandas rows
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class Checkpoint:
+    """
+    Append-only JSON-lines file of completed profiles. The first line records
+    a hash of the extracted rows; a checkpoint written for different input is
+    ignored.
+    """
+
+    def __init__(self, path, input_key, every=DEFAULT_CHECKPOINT_EVERY):
+        self.path = path
+        self.input_key = input_key
+        self.every = max(1, every)
+        self.done = {}
+        self._pending = []
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return self.done
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if not lines or json.loads(lines[0]).get("input") != self.input_key:
+            logging.warning(f"Checkpoint {self.path} is for different input, starting over")
+            return self.done
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # Torn last line from a crash
+            self.done[entry["position"]] = (entry["record"], entry["experience"])
+        return self.done
+
+    def add(self, position, record, experience_data):
+        self.done[position] = (record, experience_data)
+        self._pending.append(json.dumps(
+            {"position": position, "record": record, "experience": experience_data}, default=_json_default))
+        if len(self._pending) >= self.every:
+            self.flush()
+
+    def flush(self):
+        exists = os.path.exists(self.path)
+        if exists and not self._pending:
+            return
+        # A checkpoint for other input is replaced, not appended to
+        if exists and not self._matches():
+            exists = False
+        with open(self.path, "a" if exists else "w", encoding="utf-8") as f:
+            if not exists:
+                f.write(json.dumps({"input": self.input_key}) + "\n")
+            for line in self._pending:
+                f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = []
+
+    def _matches(self):
+        with open(self.path, encoding="utf-8") as f:
+            first = f.readline()
+        try:
+            return json.loads(first).get("input") == self.input_key
+        except ValueError:
+            return False
+
+
+def run(args):
+    metrics = RunMetrics()
+    try:
+        return _run(args, metrics)
+    finally:
+        try:
+            metrics.export(args.metrics_dir)
+        except OSError as e:
+            logging.warning(f"Could not export run metrics: {e}")
+
+
+def _run(args, metrics):
+    with metrics.stage("ingest") as stage:
+        if args.sheet_ids:
+            from cohorts import load_cohorts
+
+            data = load_cohorts(sheets_client(args.credentials), args.sheet_ids, args.all_worksheets)
+        elif args.sheet_id:
+            data = load_sheet(args.sheet_id, args.credentials)
+        else:
+            from excel_ingest import read_excel_projected
+
+            data, _, _ = read_excel_projected(args.excel)
+        stage.rows = len(data)
+    logging.info(f"Loaded {len(data)} rows")
+
+    resume_cache = ResumeCache(ttl_days=args.ttl_days)
+    try:
+        if args.sheet_ids:
+            from cohorts import extract_cohorts
+
+            df_linkedin = extract_cohorts(data, resume_cache, metrics=metrics, mode=args.resume_scan,
+                                          parse_workers=args.parse_workers)
+        else:
+            df_linkedin = extract_stage(data, resume_cache, metrics=metrics, mode=args.resume_scan,
+                                        parse_workers=args.parse_workers)
+    finally:
+        resume_cache.close()
+    logging.info(f"Extracted {len(df_linkedin)} student LinkedIn URLs")
+
+    checkpoint = Checkpoint(args.checkpoint, content_hash(df_linkedin), args.checkpoint_every)
+    done = {
+        position: entry for position, entry in checkpoint.load().items()
+        # Failed lookups (refused or throttled, no payload) are retried; everything else is final
+        if entry[1] is not None or entry[0]["Experience"] == "Invalid URL"
+    }
+    remaining = [position for position in range(len(df_linkedin)) if position not in done]
+    # Rows linking to the same profile (e.g. one student in two cohorts) share one fetch
+    groups = [[remaining[subset_position] for subset_position in group]
+              for group in profile_groups(df_linkedin.iloc[remaining])]
+    logging.info(f"{len(done)} profiles restored from checkpoint, {len(groups)} to fetch")
+
+    stopped_early = False
+    if remaining:
+        email = args.email or os.getenv("LINKEDIN_EMAIL")
+        password = args.password or os.getenv("LINKEDIN_PASSWORD")
+        if not (email and password):
+            logging.error("LinkedIn credentials are required (--email/--password or LINKEDIN_EMAIL/LINKEDIN_PASSWORD)")
+            return 2
+
+        from linkedin_api import Linkedin
+        api = Linkedin(email, password)
+
+        cache = ProfileCache(ttl_days=args.ttl_days, refresh=args.refresh)
+        stats = EnrichmentStats()
+        consecutive_failures = 0
+        try:
+            with metrics.stage("enrich") as stage, metrics.instrumented(api.client.session):
+                stage.rows = 0
+                rows = df_linkedin.to_dict("records")
+                todo = df_linkedin.iloc[[group[0] for group in groups]]
+                for done_count, (group_position, record, experience_data) in enumerate(
+                        enrich_profiles(api, todo, workers=args.workers, bucket=TokenBucket(args.rate, args.burst),
+                                        stats=stats, max_retries=args.max_retries, cache=cache), start=1):
+                    for position in groups[group_position]:
+                        checkpoint.add(position, row_record(record, rows[position]), experience_data)
+                    stage.rows = done_count
+                    failed = experience_data is None and record["Experience"] == "API Error"
+                    consecutive_failures = consecutive_failures + 1 if failed else 0
+                    if done_count % args.checkpoint_every == 0:
+                        logging.info(f"{done_count}/{len(groups)} profiles fetched ({stats.failed} failed, {stats.throttled} throttled)")
+                    if args.max_consecutive_failures and consecutive_failures >= args.max_consecutive_failures:
+                        logging.error(f"{consecutive_failures} profiles failed in a row, stopping; re-run to resume")
+                        stopped_early = True
+                        break
+        finally:
+            checkpoint.flush()
+            cache.close()
+            for event, n in (("profiles_fetched", stats.completed - stats.failed), ("profile_failures", stats.failed),
+                             ("profile_retries", stats.retries), ("profile_throttled", stats.throttled),
+                             ("profile_cache_hits", cache.hits), ("profile_cache_misses", cache.misses)):
+                metrics.count(event, n)
+        logging.info(f"Profile cache: {cache.hits} hits / {cache.misses} misses")
+
+    if stopped_early:
+        return EXIT_RETRY_LATER
+
+    records = [checkpoint.done[position][0] for position in range(len(df_linkedin))]
+    payloads = [checkpoint.done[position][1] for position in range(len(df_linkedin))]
+    scraped_data_df, experience_df = classify_stage(records, payloads, metrics=metrics)
+    with open(args.output, "wb") as f:
+        f.write(report_stage(scraped_data_df, metrics=metrics))
+    logging.info(f"Wrote {len(scraped_data_df)} rows to {args.output}")
+
+    # The dashboard's placement summary picks this run up from the snapshot
+    analytics = PlacementAnalytics.load()
+    changed = analytics.update_report(scraped_data_df, experience_df)
+    try:
+        analytics.save()
+    except OSError as e:
+        logging.warning(f"Could not save placement analytics: {e}")
+    logging.info(f"Placement analytics: {changed} students added or changed")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the placement profile pipeline without the Streamlit UI.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--sheet-id", help="Google Sheet key to read (first worksheet)")
+    source.add_argument("--sheet-ids", nargs="+", help="Google Sheet keys or URLs to read as cohorts")
+    source.add_argument("--excel", help="Path of an Excel workbook to read")
+    parser.add_argument("--output", default="scraped_data.csv", help="CSV report to write")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint.jsonl)")
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY, help="Profiles between checkpoint writes")
+    parser.add_argument("--all-worksheets", action="store_true", help="With --sheet-ids, read every worksheet as a cohort")
+    parser.add_argument("--credentials", default="credentials.json", help="Google service account file")
+    parser.add_argument("--email", help="LinkedIn username or email")
+    parser.add_argument("--password", help="LinkedIn password")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="get_profile calls per second")
+    parser.add_argument("--burst", type=int, default=DEFAULT_BURST)
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES)
+    parser.add_argument("--max-consecutive-failures", type=int, default=20,
+                        help="Stop (exit 75) after this many failed profiles in a row; 0 never stops")
+    parser.add_argument("--ttl-days", type=int, default=DEFAULT_TTL_DAYS, help="Profile and resume cache TTL")
+    parser.add_argument("--refresh", choices=REFRESH_MODES, default="stale", help="Profile cache refresh mode")
+    parser.add_argument("--resume-scan", choices=EXTRACTION_MODES, default=DEFAULT_EXTRACTION_MODE,
+                        help="Read resume link annotations only, or also printed LinkedIn URLs")
+    parser.add_argument("--parse-workers", type=int, default=DEFAULT_PARSE_WORKERS, help="Resume parsing processes")
+    parser.add_argument("--metrics-dir", default=METRICS_DIR, help="Directory for the run summary and Prometheus textfile")
+    args = parser.parse_args(argv)
+    if args.sheet_ids:
+        from cohorts import parse_sheet_ids
+
+        args.sheet_ids = parse_sheet_ids(" ".join(args.sheet_ids))
+    if args.checkpoint is None:
+        args.checkpoint = f"{args.output}.checkpoint.jsonl"
+    return args
+
+
+def main(argv=None):
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    return run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import unquote
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profile_cache.sqlite3")
+DEFAULT_TTL_DAYS = 7
+
+# Refresh modes:
+#   "stale"      - re-fetch profiles whose cache entry is older than the TTL
+#   "not_placed" - re-fetch only stale profiles that had no experience last time;
+#                  profiles that already list experience are served from cache
+#   "all"        - ignore the cache and re-fetch everything
+REFRESH_MODES = ("stale", "not_placed", "all")
+
+
+def canonical_username(username):
+    # "John-Doe-123/", "john%2Ddoe%2D123?trk=x" and "JOHN-DOE-123" are one profile
+    return unquote(str(username)).split("?")[0].strip().strip("/").lower()
+
+
+class ProfileCache:
+    """
+    On-disk cache of raw get_profile experience payloads keyed by the
+    canonical LinkedIn username, with a fetch timestamp per entry.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_days=DEFAULT_TTL_DAYS, refresh="stale"):
+        if refresh not in REFRESH_MODES:
+            raise ValueError(f"Unknown refresh mode: {refresh}")
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "username TEXT PRIMARY KEY, experience TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _is_fresh(self, experience, fetched_at):
+        if self.refresh == "all":
+            return False
+        if self.refresh == "not_placed" and experience:
+            return True
+        return time.time() - fetched_at < self.ttl
+
+    def get(self, username):
+        """Returns the cached experience list, or None if it has to be fetched."""
+        key = canonical_username(username)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT experience, fetched_at FROM profiles WHERE username = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                experience = json.loads(row[0])
+                if self._is_fresh(experience, row[1]):
+                    self.hits += 1
+                    return experience
+            self.misses += 1
+            return None
+
+    def put(self, username, experience):
+        key = canonical_username(username)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles (username, experience, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(experience), time.time()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
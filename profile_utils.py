@@ -0,0 +1,66 @@
+import re
+
+import pandas as pd
+
+# One pass pulls both the profile URL and its username out of a cell
+LINKEDIN_URL_PATTERN = re.compile(r'(?P<url>https?://(?:www\.)?linkedin\.com/in/(?P<username>[^/\s]+)[^\s]*)')
+
+IDENTITY_COLUMNS = ["Unique ID", "Student Name", "Batch Start Date", "Batch End Date"]
+# Cells that can hold a student's LinkedIn URL: the profile itself or a Drive resume
+LINK_MARKERS = r"linkedin\.com/in/|drive\.google\.com"
+
+
+def string_cells(data):
+    """
+    Stacks every text column of the sheet into one Series indexed by
+    (row position, column), so cells can be scanned with vectorized .str ops.
+    """
+    data = data.reset_index(drop=True)
+    text_columns = data.select_dtypes(include=["object", "string"])
+    if text_columns.empty:
+        return pd.Series([], dtype=str, index=pd.MultiIndex.from_tuples([], names=[None, None]))
+    cells = text_columns.stack()
+    return cells[cells.notna()].astype(str)
+
+
+def drive_file_ids(cells):
+    """
+    Returns the Google Drive file id of every Drive link cell, indexed like
+    cells. "id=" query parameters win over "/d/<id>/" paths.
+    """
+    drive_cells = cells[cells.str.contains("drive.google.com", regex=False)]
+    # Only the first "id=" / "/d/" occurrence counts, as with str.split
+    id_param = drive_cells.str.extract(r'id=([^&]*)', expand=False)
+    path_id = drive_cells.str.extract(r'/d/([^/]*)', expand=False)
+    file_ids = id_param.where(drive_cells.str.contains("id=", regex=False), path_id)
+    return file_ids.dropna()
+
+
+def extract_linkedin_links(data, extra_links=None):
+    """
+    Builds the student -> LinkedIn URL frame for a whole sheet in one step.
+
+    Every text cell is scanned with LINKEDIN_URL_PATTERN via str.extractall;
+    extra_links (a Series of URLs indexed by row position, e.g. links found in
+    resumes) is appended. Each student gets one row per distinct URL, or a
+    single "No LinkedIn URL found" row with Username "Invalid URL".
+    """
+    data = data.reset_index(drop=True)
+
+    found = string_cells(data).str.extractall(LINKEDIN_URL_PATTERN.pattern)
+    found = found.reset_index(level=[1, 2], drop=True)
+    if extra_links is not None and len(extra_links):
+        extra = extra_links.astype(str).str.extract(LINKEDIN_URL_PATTERN.pattern)
+        found = pd.concat([found, extra])
+
+    found = found.dropna(subset=["url"]).rename_axis("row").reset_index()
+    found = found.drop_duplicates(["row", "url"])
+
+    missing = data.index.difference(found["row"])
+    placeholders = pd.DataFrame({"row": missing, "url": "No LinkedIn URL found", "username": "Invalid URL"})
+    links = pd.concat([found, placeholders], ignore_index=True).sort_values("row", kind="stable")
+
+    df_linkedin = data.loc[links["row"], IDENTITY_COLUMNS].reset_index(drop=True)
+    df_linkedin["Link"] = links["url"].to_numpy()
+    df_linkedin["Username"] = links["username"].to_numpy()
+    return df_linkedin
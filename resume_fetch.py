@@ -0,0 +1,338 @@
+import hashlib
+import json
+import logging
+import os
+import multiprocessing
+import queue
+import re
+import signal
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+from http_transport import get_transport
+from metrics import in_run_context
+
+DRIVE_DOWNLOAD_URL = "https://drive.google.com/uc?export=download&id={file_id}"
+RESUME_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_cache.sqlite3")
+DEFAULT_WORKERS = 8
+DEFAULT_TTL_DAYS = 7
+DOWNLOAD_TIMEOUT = 60  # seconds
+
+# "links" reads only link annotations; "text" also scans the page text for
+# printed profile URLs, page by page until one is found
+EXTRACTION_MODES = ("links", "text")
+DEFAULT_EXTRACTION_MODE = "text"
+# Parsing is CPU-bound, so resumes are scanned in a pool of processes
+DEFAULT_PARSE_WORKERS = os.cpu_count() or 1
+DOCUMENT_TIME_BUDGET = 10  # seconds of parsing per resume
+# Extra seconds a parser process gets to start and to receive the PDF
+PARSE_GRACE = 2
+
+LINKEDIN_PDF_PATTERN = re.compile(r'https?://(?:www\.)?linkedin\.com/in/[^\s]+')
+# "linkedin.com/in/jane-doe", "www.linkedin.com/in/jane-doe/", "in.linkedin.com/in/jane-doe" in plain text
+LINKEDIN_TEXT_PATTERN = re.compile(r'(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/([\w\-%]+)', re.IGNORECASE)
+
+
+class DocumentTimeout(Exception):
+    pass
+
+
+def extract_linkedin_from_pdf(pdf_bytes):
+    # Reads the link annotations of an in-memory PDF
+    import fitz  # PyMuPDF, imported by the first resume scanned
+
+    linkedin_urls = []
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as my_pdf_file:
+        for page in my_pdf_file:
+            for pdf_link in page.links():
+                if "uri" in pdf_link:
+                    url = pdf_link["uri"]
+                    if LINKEDIN_PDF_PATTERN.match(url):
+                        linkedin_urls.append(url)
+    return linkedin_urls
+
+
+def _raise_timeout(signum, frame):
+    raise DocumentTimeout()
+
+
+@contextmanager
+def _alarm(seconds):
+    # A timer signal interrupts a page that never finishes parsing; it only
+    # exists on Unix and only fires in the main thread (as in pool workers)
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def linkedin_urls_in_text(text):
+    """Profile URLs printed in text, as https://www.linkedin.com/in/<username>."""
+    return list(dict.fromkeys(f"https://www.linkedin.com/in/{username}"
+                              for username in LINKEDIN_TEXT_PATTERN.findall(text)))
+
+
+def scan_resume(pdf_bytes, mode=DEFAULT_EXTRACTION_MODE, time_budget=DOCUMENT_TIME_BUDGET):
+    """
+    LinkedIn URLs in an in-memory PDF. In "text" mode each page's link
+    annotations and then its text are checked, stopping at the first page
+    with a profile URL. Gives up (returning []) after time_budget seconds.
+    """
+    if mode == "links":
+        return extract_linkedin_from_pdf(pdf_bytes)
+
+    import fitz  # PyMuPDF
+
+    deadline = time.monotonic() + time_budget
+    try:
+        with _alarm(time_budget), fitz.open(stream=pdf_bytes, filetype="pdf") as my_pdf_file:
+            for page in my_pdf_file:
+                urls = [pdf_link["uri"] for pdf_link in page.links()
+                        if LINKEDIN_PDF_PATTERN.match(pdf_link.get("uri", ""))]
+                urls = urls or linkedin_urls_in_text(page.get_text())
+                if urls:
+                    return urls
+                if time.monotonic() > deadline:
+                    raise DocumentTimeout()
+    except DocumentTimeout:
+        logging.warning(f"Gave up on a resume after {time_budget}s of parsing")
+    return []
+
+
+def _parse_worker(conn):
+    # Runs in a parser process: scans each resume it is sent until told to stop
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        try:
+            links = scan_resume(*job)
+        except Exception as e:
+            logging.error(f"Error parsing a resume: {e}")
+            links = []
+        conn.send(links)
+
+
+class ParsePool:
+    """
+    Parser processes shared by every run in this process. Each resume goes
+    to an idle worker; a worker that does not answer within the resume's time
+    budget (e.g. stuck inside MuPDF, where the in-process alarm cannot reach)
+    or that dies is killed and replaced, and the resume counts as having no
+    links. Workers are started on demand, up to workers at a time.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._idle = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+        # spawn, not fork: the Streamlit server is multi-threaded
+        self._context = multiprocessing.get_context("spawn")
+
+    def _start_worker(self):
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_parse_worker, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        return process, conn
+
+    def _acquire(self):
+        with self._lock:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._started < self.workers:
+                self._started += 1
+                start_new = True
+            else:
+                start_new = False
+        if start_new:
+            try:
+                return self._start_worker()
+            except Exception:
+                with self._lock:
+                    self._started -= 1
+                raise
+        return self._idle.get()
+
+    def _replace(self, worker):
+        process, conn = worker
+        process.kill()
+        process.join()
+        conn.close()
+        try:
+            self._idle.put(self._start_worker())
+        except Exception:
+            with self._lock:
+                self._started -= 1
+            raise
+
+    def scan(self, pdf_bytes, mode=DEFAULT_EXTRACTION_MODE, time_budget=DOCUMENT_TIME_BUDGET):
+        worker = self._acquire()
+        try:
+            worker[1].send((pdf_bytes, mode, time_budget))
+            if worker[1].poll(time_budget + PARSE_GRACE):
+                links = worker[1].recv()
+                self._idle.put(worker)
+                return links
+            logging.warning(f"Gave up on a resume after {time_budget}s of parsing; restarting its parser process")
+        except (EOFError, OSError):
+            # The worker died, e.g. a crash inside MuPDF
+            logging.error("Resume parser process died; skipping this resume")
+        self._replace(worker)
+        return []
+
+
+# One pool per process, sized by the first run that needs it and kept across runs
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool(workers=DEFAULT_PARSE_WORKERS):
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ParsePool(workers)
+        elif workers != _parse_pool.workers:
+            # Other runs may be using it, so it is not resized
+            logging.info(f"Reusing the resume parse pool with {_parse_pool.workers} workers, not {workers}")
+        return _parse_pool
+
+
+class ResumeCache:
+    """
+    LinkedIn URLs found in each resume, keyed by Drive file id and by the
+    SHA-256 of the PDF. A file id seen within the TTL is not downloaded
+    again; a re-downloaded file with a known hash is not parsed again.
+    Entries only answer lookups in the extraction mode that produced them.
+    """
+
+    def __init__(self, path=RESUME_CACHE_PATH, ttl_days=DEFAULT_TTL_DAYS):
+        self.ttl = ttl_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            "file_id TEXT PRIMARY KEY, content_hash TEXT NOT NULL, links TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS resumes_hash ON resumes (content_hash)")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(resumes)")]
+        if "mode" not in columns:
+            # Caches written before text scanning hold link-annotation results
+            self._conn.execute("ALTER TABLE resumes ADD COLUMN mode TEXT NOT NULL DEFAULT 'links'")
+        self._conn.commit()
+
+    def by_file_id(self, file_id, mode=DEFAULT_EXTRACTION_MODE):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT links, fetched_at FROM resumes WHERE file_id = ? AND mode = ?", (file_id, mode)
+            ).fetchone()
+            if row is not None and time.time() - row[1] < self.ttl:
+                self.hits += 1
+                return json.loads(row[0])
+            self.misses += 1
+            return None
+
+    def by_hash(self, content_hash, mode=DEFAULT_EXTRACTION_MODE):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT links FROM resumes WHERE content_hash = ? AND mode = ? LIMIT 1", (content_hash, mode)
+            ).fetchone()
+            return json.loads(row[0]) if row is not None else None
+
+    def put(self, file_id, content_hash, links, mode=DEFAULT_EXTRACTION_MODE):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resumes (file_id, content_hash, links, fetched_at, mode) VALUES (?, ?, ?, ?, ?)",
+                (file_id, content_hash, json.dumps(links), time.time(), mode),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def resume_links(transport, file_id, cache=None, mode=DEFAULT_EXTRACTION_MODE, scan=None):
+    """
+    Returns the LinkedIn URLs in one Drive resume, using the cache when
+    possible. scan(pdf_bytes) parses a download; by default scan_resume in
+    this process.
+    """
+    if cache is not None:
+        links = cache.by_file_id(file_id, mode)
+        if links is not None:
+            return links
+
+    try:
+        response = transport.get(DRIVE_DOWNLOAD_URL.format(file_id=file_id), endpoint="drive_resume", timeout=DOWNLOAD_TIMEOUT)
+        if response.status_code != 200:
+            return []
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        links = cache.by_hash(content_hash, mode) if cache is not None else None
+        if links is None:
+            links = scan(response.content) if scan is not None else scan_resume(response.content, mode)
+        if cache is not None:
+            cache.put(file_id, content_hash, links, mode)
+        return links
+    except Exception as e:
+        logging.error(f"Error processing Google Drive link: {e}")
+        return []
+
+
+def _instrumented(metrics, session):
+    return metrics.instrumented(session) if metrics is not None else nullcontext()
+
+
+def fetch_resume_links(file_ids, workers=DEFAULT_WORKERS, cache=None, metrics=None, mode=DEFAULT_EXTRACTION_MODE,
+                       parse_workers=DEFAULT_PARSE_WORKERS, time_budget=DOCUMENT_TIME_BUDGET):
+    """
+    Downloads the Drive resumes in file_ids (a Series of file ids indexed by
+    (row, column), see profile_utils.drive_file_ids) concurrently and returns
+    the LinkedIn URLs found as a Series indexed by row. Each distinct file is
+    fetched once, however many rows point to it. Downloads are parsed in
+    the shared parser processes (see ParsePool; in the downloading threads
+    when parse_workers is 1), each within time_budget seconds. Downloads are recorded in metrics (a
+    metrics.RunMetrics) when given.
+    """
+    unique_ids = list(dict.fromkeys(file_ids))
+    if not unique_ids:
+        return pd.Series([], dtype=object)
+
+    workers = max(1, min(workers, len(unique_ids)))
+    if parse_workers > 1:
+        pool = get_parse_pool(parse_workers)
+
+        def scan(pdf_bytes):
+            return pool.scan(pdf_bytes, mode, time_budget)
+    else:
+        def scan(pdf_bytes):
+            return scan_resume(pdf_bytes, mode, time_budget)
+
+    transport = get_transport()
+    with ThreadPoolExecutor(max_workers=workers) as executor, _instrumented(metrics, transport.session):
+        links_by_id = dict(zip(unique_ids, executor.map(
+            in_run_context(lambda file_id: resume_links(transport, file_id, cache, mode, scan)), unique_ids)))
+
+    rows, urls = [], []
+    for (row, _), file_id in file_ids.items():
+        for linkedin_url in links_by_id[file_id]:
+            rows.append(row)
+            urls.append(linkedin_url)
+    return pd.Series(urls, index=rows, dtype=object)
@@ -0,0 +1,128 @@
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# field:value or field:"quoted value"; a bare value searches every field
+QUERY_PATTERN = re.compile(r'(?:(\w+):)?(?:"([^"]*)"|(\S+))')
+
+# Query prefixes accepted for each indexed field
+FIELD_ALIASES = {
+    "name": "name", "student": "name",
+    "company": "company",
+    "title": "title", "role": "title",
+    "class": "class", "classification": "class",
+    "url": "url", "link": "url",
+    "id": "id",
+}
+REPORT_FIELDS = {
+    "name": "Student Name",
+    "class": "Experience Classification",
+    "url": "LinkedIn URL",
+    "id": "Unique ID",
+}
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class _FieldIndex:
+    """
+    All (token, row) pairs of one field sorted by token then row, so the rows
+    of every token sharing a prefix form one contiguous slice.
+    """
+
+    def __init__(self, rows, values):
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        rows, codes = rows[codes >= 0], codes[codes >= 0]
+
+        # Tokenize each distinct value once; cohorts repeat companies and labels a lot
+        vocabulary = {}
+        pair_tokens, pair_codes = [], []
+        for code, value in enumerate(uniques):
+            for token in set(tokenize(value)):
+                pair_tokens.append(vocabulary.setdefault(token, len(vocabulary)))
+                pair_codes.append(code)
+        self.tokens = sorted(vocabulary)
+        rank = np.empty(len(vocabulary), dtype=np.int64)
+        rank[[vocabulary[token] for token in self.tokens]] = np.arange(len(self.tokens))
+
+        # Expand every (token, distinct value) pair to the rows holding that value
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        pair_tokens = rank[np.asarray(pair_tokens, dtype=np.int64)]
+        pair_codes = np.asarray(pair_codes, dtype=np.int64)
+        counts = bounds[pair_codes + 1] - bounds[pair_codes]
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_rows = rows[order[np.repeat(bounds[pair_codes], counts) + offsets]]
+
+        stride = (int(rows.max()) + 1) if len(rows) else 1
+        keys = np.sort(np.repeat(pair_tokens, counts) * stride + pair_rows)
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        self.rows = keys % stride
+        self.bounds = np.searchsorted(keys // stride, np.arange(len(self.tokens) + 1))
+
+    def prefix_rows(self, prefix):
+        lo = bisect_left(self.tokens, prefix)
+        hi = bisect_left(self.tokens, prefix + "\uffff", lo)
+        matched = self.rows[self.bounds[lo]:self.bounds[hi]]
+        return matched if hi - lo <= 1 else np.unique(matched)
+
+
+class SearchIndex:
+    """
+    Inverted token index over the placement report, built once per report.
+
+    Queries are whitespace-separated terms, all of which must match. A term
+    is a token prefix ("infos" matches "Infosys"), optionally scoped to one
+    field and quoted to keep several words together:
+
+        company:infosys class:"Self Placed" priya
+
+    Quotes only group words under one field; each word is still matched on
+    its own, not as a phrase ("Placed Self" matches "Self Placed").
+    """
+
+    def __init__(self, report, experience=None):
+        self.size = len(report)
+        positions = pd.Series(np.arange(len(report)), index=report.index)
+        self.fields = {}
+        for field, column in REPORT_FIELDS.items():
+            if column in report.columns:
+                self.fields[field] = _FieldIndex(positions.to_numpy(), report[column].to_numpy())
+
+        # Company and title come from every position in the experience table
+        if experience is not None and len(experience):
+            in_report = experience.index.isin(report.index)
+            rows = positions.reindex(experience.index[in_report]).to_numpy()
+            for field, column in (("company", "Company"), ("title", "Title")):
+                self.fields[field] = _FieldIndex(rows, experience[column].astype(object).to_numpy()[in_report])
+
+    def _term_rows(self, field, token):
+        if field is not None:
+            index = self.fields.get(field)
+            return index.prefix_rows(token) if index is not None else np.empty(0, dtype=np.int64)
+        matches = [index.prefix_rows(token) for index in self.fields.values()]
+        return np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int64)
+
+    def search(self, query):
+        """
+        Returns the sorted row positions of the report that match query;
+        none for a query without any words (e.g. only punctuation).
+        """
+        result = None
+        for prefix, quoted, bare in QUERY_PATTERN.findall(query):
+            field = FIELD_ALIASES.get(prefix.lower()) if prefix else None
+            text = quoted or bare
+            if prefix and field is None:
+                # Not a known field, e.g. "https://..." - search the whole term
+                text = f"{prefix}:{text}"
+            for token in tokenize(text):
+                rows = self._term_rows(field, token)
+                result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+                if not len(result):
+                    return result
+        return result if result is not None else np.empty(0, dtype=np.int64)
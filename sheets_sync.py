@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pandas as pd
+
+from profile_utils import IDENTITY_COLUMNS, LINK_MARKERS, string_cells
+
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+# Columns the sync writes back to the sheet; they are never read as input.
+# The prefix keeps them apart from input columns such as "LinkedIn URL".
+RESULT_PREFIX = "Sync: "
+URL_COLUMN = f"{RESULT_PREFIX}LinkedIn URL"
+CLASSIFICATION_COLUMN = f"{RESULT_PREFIX}Experience Classification"
+SYNCED_AT_COLUMN = f"{RESULT_PREFIX}Last Synced"
+FINGERPRINT_COLUMN = f"{RESULT_PREFIX}Fingerprint"
+RESULT_COLUMNS = [URL_COLUMN, CLASSIFICATION_COLUMN, SYNCED_AT_COLUMN, FINGERPRINT_COLUMN]
+
+
+def sheets_client(credentials_file):
+    # gspread and google-auth are imported by the first run that reads a sheet
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    return gspread.authorize(Credentials.from_service_account_file(credentials_file, scopes=SCOPES))
+
+
+def source_columns(data):
+    return [col for col in data.columns if col not in RESULT_COLUMNS]
+
+
+def row_fingerprints(data):
+    """
+    Hashes each row's identity cells (Unique ID and batch dates) together
+    with its LinkedIn / Drive link cells. Edits anywhere else in the row do
+    not change the fingerprint.
+    """
+    data = data[source_columns(data)].reset_index(drop=True)
+    cells = string_cells(data)
+    links = cells[cells.str.contains(LINK_MARKERS)]
+    link_text = links.groupby(level=0).agg("\n".join).reindex(data.index, fill_value="")
+
+    key = link_text.astype(str)
+    for col in reversed(IDENTITY_COLUMNS):
+        if col != "Student Name":
+            key = data[col].astype(str) + "|" + key
+    hashes = pd.util.hash_array(key.to_numpy(dtype=object))
+    return pd.Series([f"{h:016x}" for h in hashes], index=data.index)
+
+
+def changed_rows(data, fingerprints):
+    """Rows that are new, were edited since the last sync, or have no result yet."""
+    data = data.reset_index(drop=True)
+    if FINGERPRINT_COLUMN not in data.columns or CLASSIFICATION_COLUMN not in data.columns:
+        return pd.Series(True, index=data.index)
+    return (data[FINGERPRINT_COLUMN] != fingerprints) | (data[CLASSIFICATION_COLUMN] == "")
+
+
+def _student_results(report):
+    # One result per student, however many LinkedIn URLs they have
+    grouped = report.groupby("Unique ID", sort=False)
+    return pd.DataFrame({
+        "LinkedIn URL": grouped["LinkedIn URL"].agg(lambda urls: "\n".join(dict.fromkeys(urls))),
+        "Experience Classification": grouped["Experience Classification"].agg(lambda labels: ", ".join(dict.fromkeys(labels))),
+    })
+
+
+def write_back(worksheet, header, data, fingerprints, changed, report):
+    """
+    Writes the classification of every processed row, and its fingerprint,
+    into the result columns with a single batch_update call. Missing result
+    columns are appended to the header row in the same call.
+    """
+    from gspread.utils import rowcol_to_a1
+
+    header = list(header)
+    updates = []
+    for col in RESULT_COLUMNS:
+        if col not in header:
+            header.append(col)
+            updates.append({"range": rowcol_to_a1(1, len(header)), "values": [[col]]})
+    if len(header) > worksheet.col_count:
+        worksheet.add_cols(len(header) - worksheet.col_count)
+
+    data = data.reset_index(drop=True)
+    results = _student_results(report)
+    synced_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+    for position in data.index[changed.to_numpy()]:
+        unique_id = data.at[position, "Unique ID"]
+        if unique_id not in results.index:
+            continue
+        values = {
+            URL_COLUMN: results.at[unique_id, "LinkedIn URL"],
+            CLASSIFICATION_COLUMN: results.at[unique_id, "Experience Classification"],
+            SYNCED_AT_COLUMN: synced_at,
+            FINGERPRINT_COLUMN: fingerprints[position],
+        }
+        # Sheet rows are 1-based and the header takes row 1
+        for col, value in values.items():
+            updates.append({"range": rowcol_to_a1(position + 2, header.index(col) + 1), "values": [[value]]})
+
+    if updates:
+        worksheet.batch_update(updates, value_input_option="RAW")
+    return len(updates)
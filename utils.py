@@ -1,137 +1,298 @@
+import queue
+import re
+import threading
 import time
 import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
+from concurrent.futures import ThreadPoolExecutor
 import urllib.parse
 
 from urllib.parse import quote
 import os
 
+from browser_pool import get_driver_pool
+from html_fields import Field, FieldSpec, parse_html
+from http_transport import get_transport
+from job_sink import JobSink, session_output_path
 
-def scrape_linkedin(job_role, location="India", num_jobs=10):
-    job_list = []
-    options = Options()
-    options.add_argument("--headless")
-    driver = webdriver.Chrome(options=options)
-    
+
+LINKEDIN_LIST_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={role}&location={location}&start={start}&f_E=2&f_TPR=r86400"
+LINKEDIN_JOB_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+LINKEDIN_PAGE_SIZE = 25
+LINKEDIN_COLUMNS = ["Job ID", "Job Title", "Company Name", "Location", "time_posted", "job_description", "Apply Link"]
+
+# Field name -> selector for the list cards and the job detail page
+LINKEDIN_LIST_FIELDS = FieldSpec({"Apply Link": Field("a.base-card__full-link", attr="href")}, root="li")
+LINKEDIN_JOB_FIELDS = FieldSpec({
+    "Job Title": Field("h2.top-card-layout__title"),
+    "Company Name": Field("a.topcard__org-name-link"),
+    "Location": Field("span.topcard__flavor--bullet"),
+    "time_posted": Field("span.posted-time-ago__text"),
+    "job_description": Field("div.description__text--rich"),
+})
+
+# Number of job detail pages downloaded in parallel over the shared transport
+DEFAULT_CONCURRENCY = 8
+
+
+def _fetch_linkedin_list(transport, encoded_role, location, page_num):
+    # Returns the apply link of every listed job (None where a card has none)
+    list_url = LINKEDIN_LIST_URL.format(role=encoded_role, location=location, start=page_num * LINKEDIN_PAGE_SIZE)
+    try:
+        response = transport.get(list_url, endpoint="linkedin_list")
+    except requests.RequestException as e:
+        print(f"Error fetching job list: {e}")
+        return None
+    if response.status_code != 200:
+        return None
+
+    return [card["Apply Link"] for card in LINKEDIN_LIST_FIELDS.extract_all(parse_html(response.text))]
+
+
+def linkedin_job_id(apply_link):
+    return apply_link.split('?')[0][-10:]
+
+
+def naukri_job_id(vacancy_link):
+    # Naukri links end in a numeric posting id, e.g. ...-2-to-5-years-010424500123?src=...
+    match = NAUKRI_JOB_ID_PATTERN.search(vacancy_link)
+    return match.group(1) if match else vacancy_link.split('?')[0]
+
+
+def job_id_of(platform, job):
+    # Key of a scraped posting in the JobStore
+    return str(job["Job ID"]) if platform == "linkedin" else naukri_job_id(job['Vacancy Link'])
+
+
+def _fetch_linkedin_job(transport, apply_link):
+    job_ID = linkedin_job_id(apply_link)
+    job_url = LINKEDIN_JOB_URL.format(job_id=job_ID)
+
+    try:
+        job_response = transport.get(job_url, endpoint="linkedin_job")
+    except requests.RequestException as e:
+        print(f"Error fetching job {job_ID}: {e}")
+        return None
+    if job_response.status_code != 200:
+        return None
+
+    return parse_linkedin_job(job_response.text, job_ID, apply_link)
+
+
+def parse_linkedin_job(page_source, job_id, apply_link):
+    return {"Job ID": job_id, **LINKEDIN_JOB_FIELDS.extract(parse_html(page_source)), "Apply Link": apply_link}
+
+
+def iter_linkedin_jobs(job_role, location="India", num_jobs=10, concurrency=DEFAULT_CONCURRENCY, store=None):
+    """
+    Yields up to num_jobs LinkedIn postings, in listing order, as their
+    details arrive. With a JobStore, postings already stored are served from
+    it without downloading their detail page, and new ones are added to it.
+    """
+    found = 0
     encoded_role = job_role.replace(" ", "%20")
-    count = 0
+    concurrency = max(1, int(concurrency))
     page_num = 0
 
-    while count < num_jobs:
-        start = page_num * 25
-        list_url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={encoded_role}&location={location}&start={start}&f_E=2&f_TPR=r86400"
-        
-        response = requests.get(list_url)
-        if response.status_code != 200:
-            print(f"Failed to retrieve job list for page {page_num}")
-            break
-        
-        list_soup = BeautifulSoup(response.text, "html.parser")
-        page_jobs = list_soup.find_all("li")
-
-        for job in page_jobs:
-            if count >= num_jobs:
+    transport = get_transport()
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    next_page = pool.submit(_fetch_linkedin_list, transport, encoded_role, location, page_num)
+    try:
+        while found < num_jobs:
+            page_jobs = next_page.result()
+            next_page = None
+            if page_jobs is None:
+                print(f"Failed to retrieve job list for page {page_num}")
                 break
+            if len(page_jobs) == 0:
+                break  # Stop if no more jobs available
+
+            apply_links = [apply_link for apply_link in page_jobs if apply_link]
+
+            known = store.seen("linkedin", map(linkedin_job_id, apply_links)) if store is not None else {}
+
+            # Fetch the next list page ahead while this page's details download,
+            # unless this page alone is already enough to reach num_jobs
+            if len(apply_links) < num_jobs - found:
+                next_page = pool.submit(_fetch_linkedin_list, transport, encoded_role, location, page_num + 1)
+
+            # Only request as many details as are still missing; failed postings
+            # are topped up from the rest of the page so num_jobs is met exactly
+            pos = 0
+            while pos < len(apply_links) and found < num_jobs:
+                batch = apply_links[pos:pos + num_jobs - found]
+                pos += len(batch)
+                fetched = pool.map(lambda link: _fetch_linkedin_job(transport, link),
+                                   [link for link in batch if linkedin_job_id(link) not in known])
+                for link in batch:
+                    job_post = known.get(linkedin_job_id(link))
+                    if job_post is None:
+                        job_post = next(fetched)
+                        if job_post is not None and store is not None:
+                            store.put("linkedin", job_post["Job ID"], job_post)
+                    if job_post is not None:
+                        found += 1
+                        yield job_post
+
+            page_num += 1
+            if next_page is None and found < num_jobs:
+                next_page = pool.submit(_fetch_linkedin_list, transport, encoded_role, location, page_num)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def scrape_linkedin(job_role, location="India", num_jobs=10, concurrency=DEFAULT_CONCURRENCY, output_path=None, store=None):
+    # Streams the postings into a per-call CSV; returns its path, or None when nothing was found
+    output_path = output_path or session_output_path("linkedin")
+    with JobSink(output_path, fieldnames=LINKEDIN_COLUMNS) as sink:
+        for job_post in iter_linkedin_jobs(job_role, location, num_jobs, concurrency, store):
+            sink.write(job_post)
+    return output_path if sink.count else None
+
+NAUKRI_SEARCH_URL = "https://www.naukri.com/{path_role}-jobs{page_suffix}?k={query_role}&experience=2"
+# Safety stop in case Naukri keeps serving the same results for every page
+NAUKRI_MAX_PAGES = 50
+
+# Fields of one result tuple, compiled once and run against page_source
+NAUKRI_TUPLE_FIELDS = FieldSpec({
+    'Job Role': Field("h2 a", separator=" "),
+    'Company Name': Field(":scope > div > div:nth-of-type(2) a", separator=" ", default="Not Available", keep_blank=False),
+    'Vacancy Link': Field("h2 a", attr="href", keep_blank=False),
+    'Experience Needed': Field(":scope > div > div:nth-of-type(3) > div > span:nth-of-type(1) > span > span", separator=" ", default="Not Available", keep_blank=False),
+    'Salary': Field(":scope > div > div:nth-of-type(3) > div > span:nth-of-type(2) > span > span", separator=" ", default="Not Disclosed", keep_blank=False),
+    'Location': Field(":scope > div > div:nth-of-type(3) > div > span:nth-of-type(3) > span > span", separator=" ", default="Not Available", keep_blank=False),
+}, root=".srp-jobtuple-wrapper")
+NAUKRI_DESCRIPTION = '[class*="styles_JDC__dang-inner-html"]'
+NAUKRI_JOB_ID_PATTERN = re.compile(r"-(\d{6,})(?:[/?#]|$)")
+NAUKRI_COLUMNS = ["Job Role", "Company Name", "Vacancy Link", "Experience Needed", "Salary", "Location", "Job Description"]
+
+
+def iter_naukri_jobs(job_role, num_jobs=10, description_workers=None, store=None):
+    """
+    Yields up to num_jobs Naukri postings as soon as each description has
+    been read. With a JobStore, stored postings are yielded first without
+    opening their vacancy page, and new ones are added to it.
+    """
+    pool = get_driver_pool()
+    with pool.driver() as driver:
+        jobs_list = _scrape_naukri_results(pool, driver, job_role, num_jobs)
+
+    if store is not None:
+        known = store.seen("naukri", [naukri_job_id(job['Vacancy Link']) for job in jobs_list])
+        for job in jobs_list:
+            if naukri_job_id(job['Vacancy Link']) in known:
+                yield known[naukri_job_id(job['Vacancy Link'])]
+        jobs_list = [job for job in jobs_list if naukri_job_id(job['Vacancy Link']) not in known]
+
+    # Descriptions are read in a second stage, one browser per worker,
+    # instead of navigating back and forth from the results page
+    for job in _fetch_naukri_descriptions(pool, jobs_list, description_workers or pool.max_size):
+        if store is not None:
+            store.put("naukri", naukri_job_id(job['Vacancy Link']), job)
+        yield job
+
+
+def scrape_naukri(job_role, num_jobs=10, description_workers=None, output_path=None, store=None):
+    # Streams the postings into a per-call CSV; returns its path, or None when nothing was found
+    output_path = output_path or session_output_path("naukri")
+    with JobSink(output_path, fieldnames=NAUKRI_COLUMNS) as sink:
+        for job in iter_naukri_jobs(job_role, num_jobs, description_workers, store):
+            sink.write(job)
+    return output_path if sink.count else None
+
+
+def _parse_naukri_page(page_source):
+    jobs = []
+    for job in NAUKRI_TUPLE_FIELDS.extract_all(parse_html(page_source)):
+        if job['Vacancy Link'] is None:
+            continue
+        job['Job Description'] = "Not Available"
+        jobs.append(job)
+    return jobs
+
+
+def _scrape_naukri_results(pool, driver, job_role, num_jobs):
+    # Selenium is only imported once a Naukri scrape needs the browser
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
 
-            apply_link_tag = job.find("a", class_="base-card__full-link")
-            if apply_link_tag:
-                apply_link = apply_link_tag["href"]
-                job_ID = apply_link.split('?')[0][-10:]
-                job_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_ID}"
-                
-                job_response = requests.get(job_url)
-                if job_response.status_code != 200:
-                    continue
-                
-                job_soup = BeautifulSoup(job_response.text, "html.parser")
-
-                job_post = {
-                    "Job ID": job_ID,
-                    "Job Title": job_soup.find("h2", class_="top-card-layout__title").text.strip() if job_soup.find("h2", class_="top-card-layout__title") else None,
-                    "Company Name": job_soup.find("a", class_="topcard__org-name-link").text.strip() if job_soup.find("a", class_="topcard__org-name-link") else None,
-                    "Location": job_soup.find("span", class_="topcard__flavor--bullet").text.strip() if job_soup.find("span", class_="topcard__flavor--bullet") else None,
-                    "time_posted": job_soup.find("span", class_="posted-time-ago__text").text.strip() if job_soup.find("span", class_="posted-time-ago__text") else None,
-                    "job_description": job_soup.find("div", class_="description__text--rich").text.strip() if job_soup.find("div", class_="description__text--rich") else None,
-                    "Apply Link": apply_link
-                    
-                }
-                
-                job_list.append(job_post)
-                count += 1
-
-        page_num += 1
-        if len(page_jobs) == 0:
-            break  # Stop if no more jobs available
-
-    driver.quit()
-
-    df = pd.DataFrame(job_list)
-    csv_file_path = "linkedin_jobs.csv"
-    df.to_csv(csv_file_path, index=False)
-    return csv_file_path if not df.empty else None
-
-def scrape_naukri(job_role, num_jobs=10):
-    options = Options()
-    driver = webdriver.Chrome(options=options)
     wait = WebDriverWait(driver, 20)
 
     path_role = job_role.replace(" ", "-")
     query_role = urllib.parse.quote(job_role)
-    url = f"https://www.naukri.com/{path_role}-jobs?k={query_role}&experience=2"
-    driver.get(url)
 
     jobs_list = []
-    count, new_index, i = num_jobs, 1, 0
+    seen_links = set()
+    for page_num in range(1, NAUKRI_MAX_PAGES + 1):
+        page_suffix = f"-{page_num}" if page_num > 1 else ""
+        pool.load(driver, NAUKRI_SEARCH_URL.format(path_role=path_role, page_suffix=page_suffix, query_role=query_role))
+        try:
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".srp-jobtuple-wrapper")))
+        except TimeoutException:
+            break  # No results on this page
+
+        new_jobs = [job for job in _parse_naukri_page(driver.page_source) if job['Vacancy Link'] not in seen_links]
+        if not new_jobs:
+            break  # Past the last page
+
+        for job in new_jobs:
+            if len(jobs_list) >= num_jobs:
+                break
+            if job['Vacancy Link'] in seen_links:
+                continue
+            seen_links.add(job['Vacancy Link'])
+            jobs_list.append(job)
+
+        if len(jobs_list) >= num_jobs:
+            break
+
+    return jobs_list
+
+
+def _read_naukri_descriptions(pool, jobs, done, stop):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        with pool.driver() as driver:
+            wait = WebDriverWait(driver, 20)
+            for job in jobs:
+                if stop.is_set():
+                    break
+                try:
+                    pool.load(driver, job['Vacancy Link'])
+                    job['Job Description'] = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, NAUKRI_DESCRIPTION))).text
+                except Exception:
+                    job['Job Description'] = "Not Available"
+                done.put(job)
+    finally:
+        done.put(None)  # This worker is finished
+
+
+def _fetch_naukri_descriptions(pool, jobs_list, workers):
+    """Reads every posting's description and yields the postings in completion order."""
+    workers = max(1, min(workers, len(jobs_list)))
+    if not jobs_list:
+        return
 
-    while i < count:
+    # Round-robin the postings so each worker keeps a single browser busy
+    chunks = [jobs_list[w::workers] for w in range(workers)]
+    done = queue.Queue()
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_read_naukri_descriptions, pool, chunk, done, stop) for chunk in chunks]
         try:
-            heading_xpath = f'(//*[@class="srp-jobtuple-wrapper"])[{new_index}]//h2/a'
-            link_xpath = f'(//*[@class="srp-jobtuple-wrapper"])[{new_index}]//h2/a'
-            subheading_xpath = f'(//*[@class="srp-jobtuple-wrapper"])[{new_index}]/div/div[2]//a'
-            experience_xpath = f'(//*[@class="srp-jobtuple-wrapper"])[{new_index}]/div/div[3]/div/span[1]/span/span'
-            salary_xpath = f'(//*[@class="srp-jobtuple-wrapper"])[{new_index}]/div/div[3]/div/span[2]/span/span'
-            location_xpath = f'(//*[@class="srp-jobtuple-wrapper"])[{new_index}]/div/div[3]/div/span[3]/span/span'
-            
-            heading = wait.until(EC.presence_of_element_located((By.XPATH, heading_xpath))).text
-            link = wait.until(EC.presence_of_element_located((By.XPATH, link_xpath))).get_attribute('href')
-            subheading = wait.until(EC.presence_of_element_located((By.XPATH, subheading_xpath))).text
-            experience = wait.until(EC.presence_of_element_located((By.XPATH, experience_xpath))).text
-            salary = wait.until(EC.presence_of_element_located((By.XPATH, salary_xpath))).text if wait.until(EC.presence_of_element_located((By.XPATH, salary_xpath))) else "Not Disclosed"
-            location = wait.until(EC.presence_of_element_located((By.XPATH, location_xpath))).text if wait.until(EC.presence_of_element_located((By.XPATH, location_xpath))) else "Not Available"
-            
-            # Navigate to job detail page to extract job description
-            driver.get(link)
-            job_desc_xpath = '//*[contains(@class, "styles_JDC__dang-inner-html__h0K4t")]'
-            try:
-                job_description = wait.until(EC.presence_of_element_located((By.XPATH, job_desc_xpath))).text
-            except:
-                job_description = "Not Available"
-            driver.back()
-            
-            jobs_list.append({
-                'Job Role': heading,
-                'Company Name': subheading,
-                'Vacancy Link': link,
-                'Experience Needed': experience,
-                'Salary': salary,
-                'Location': location,
-                'Job Description': job_description
-            })
-            
-            new_index += 1
-            i += 1
-        except Exception:
-            new_index += 1
-
-    driver.quit()
-    
-    df = pd.DataFrame(jobs_list)
-    csv_file_path = os.path.join(os.path.dirname(__file__), 'naukri_jobs.csv')
-    df.to_csv(csv_file_path, index=False)
-    return csv_file_path if not df.empty else None
+            finished = 0
+            while finished < workers:
+                job = done.get()
+                if job is None:
+                    finished += 1
+                else:
+                    yield job
+        finally:
+            # Lets the workers wind down when the caller stops early
+            stop.set()
+        for future in futures:
+            future.result()